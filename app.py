@@ -1,10 +1,66 @@
 # app.py
-from flask import Flask, request, jsonify, render_template_string
-from banking_bot.core import build_orchestrator
+import hmac
+import itertools
+import json
+import os
+import threading
+from typing import List
+from flask import Flask, Response, request, jsonify, render_template_string, stream_with_context
+from banking_bot import config
+from banking_bot.core import Overloaded, SessionStore, build_orchestrator
+from banking_bot.metrics import REGISTRY
 from banking_bot.models import ChatMessage
 
 app = Flask(__name__)
-orchestrator = build_orchestrator()
+
+# Built on first use, or once in the gunicorn master (see gunicorn.conf.py) so
+# that forked workers share the model and index pages copy-on-write.
+_orchestrator = None
+_orchestrator_lock = threading.Lock()
+_build_thread: threading.Thread | None = None
+
+MAX_SESSION_ID_LEN = 64
+
+
+def get_orchestrator():
+    global _orchestrator
+    if _orchestrator is None:
+        with _orchestrator_lock:
+            if _orchestrator is None:
+                _orchestrator = build_orchestrator()
+    return _orchestrator
+
+
+def _build_in_background() -> None:
+    try:
+        get_orchestrator()
+    except Exception as e:
+        print("Pipeline build error:", e)
+
+
+def start_build() -> None:
+    """
+    Build the pipeline in a daemon thread unless it is built or being built,
+    so readiness does not wait for the first chat request.
+    """
+    global _build_thread
+    with _orchestrator_lock:
+        if _orchestrator is not None or (_build_thread is not None and _build_thread.is_alive()):
+            return
+        _build_thread = threading.Thread(target=_build_in_background, name="pipeline-build", daemon=True)
+        _build_thread.start()
+
+
+def after_fork() -> None:
+    if _orchestrator is not None:
+        _orchestrator.after_fork()
+
+
+@app.errorhandler(Overloaded)
+def overloaded(e: Overloaded):
+    response = jsonify({"error": "The assistant is busy, please try again shortly.", "retry_after": e.retry_after_s})
+    response.headers["Retry-After"] = str(e.retry_after_s)
+    return response, 503
 
 CHAT_TEMPLATE = """
 <!DOCTYPE html>
@@ -169,7 +225,11 @@ CHAT_TEMPLATE = """
   </div>
   <script>
     const chat = document.getElementById('chat');
+    let sessionId = null;
+    // also sent with every message: the session lives in one worker's memory,
+    // and another worker may answer the next message
     let history = [];
+    const MAX_HISTORY = 12;
 
     function appendMessage(text, sender="bot") {
       const m = document.createElement('div');
@@ -209,25 +269,66 @@ CHAT_TEMPLATE = """
       const text = input.value.trim();
       if (!text) return;
       appendMessage(text, "user");
-      history.push({role: "user", content: text});
       input.value = "";
 
       showThinking();
 
       try {
-        const res = await fetch('/api/chat', {
+        const res = await fetch('/api/chat/stream', {
           method: 'POST',
           headers: {'Content-Type':'application/json'},
-          body: JSON.stringify({message: text, history: history})
+          body: JSON.stringify({message: text, session_id: sessionId, history: history})
         });
-        const j = await res.json();
-        hideThinking();
-        let respText = j.response || "No response.";
-        if (j.intent === "risky" || j.intent === "sensitive") {
-          respText = "⚠️ " + respText;
+        if (res.status === 503) {
+          hideThinking();
+          appendMessage("⚠️ The assistant is busy right now. Please try again in a few seconds.", "bot");
+          return;
         }
-        appendMessage(respText, "bot");
-        history.push({role: "assistant", content: respText});
+        if (!res.ok || !res.body) throw new Error("stream unavailable");
+
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+        let bubble = null;
+        let respText = "";
+        let prefix = "";
+
+        const handleEvent = (event, data) => {
+          if (event === "meta") {
+            hideThinking();
+            sessionId = data.session_id || sessionId;
+            prefix = (data.intent === "risky" || data.intent === "sensitive") ? "⚠️ " : "";
+            bubble = appendMessage(prefix, "bot").querySelector('.bubble');
+          } else if (event === "token" && bubble) {
+            respText += data.text;
+            bubble.textContent = prefix + respText;
+            chat.scrollTop = chat.scrollHeight;
+          } else if (event === "done") {
+            respText = data.response || respText || "No response.";
+            if (bubble) bubble.textContent = prefix + respText;
+            history.push({role: "user", content: text}, {role: "assistant", content: respText});
+            history = history.slice(-MAX_HISTORY);
+          }
+        };
+
+        while (true) {
+          const {value, done} = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, {stream: true});
+          let sep;
+          while ((sep = buffer.indexOf("\n\n")) !== -1) {
+            const frame = buffer.slice(0, sep);
+            buffer = buffer.slice(sep + 2);
+            let event = "message", data = "";
+            for (const line of frame.split("\n")) {
+              if (line.startsWith("event:")) event = line.slice(6).trim();
+              else if (line.startsWith("data:")) data += line.slice(5).trim();
+            }
+            if (data) handleEvent(event, JSON.parse(data));
+          }
+        }
+        hideThinking();
+        if (!bubble) throw new Error("empty stream");
       } catch (e) {
         hideThinking();
         appendMessage("⚠️ Error contacting the assistant.", "bot");
@@ -243,21 +344,197 @@ def index():
     return render_template_string(CHAT_TEMPLATE)
 
 
+def parse_chat_body(data):
+    """
+    Body: {"message": "...", "session_id": "...", "history": [...]}; the reply
+    carries the session_id to send with the next message (a new one is
+    issued when it is missing). "history" (earlier turns, without the new
+    message) is optional with a session id, but needed with several worker
+    processes unless requests are routed to the same worker per session.
+    Raises ValueError (message for the client) on malformed bodies; shared
+    with asgi.py.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("body must be a JSON object")
+    user_msg = data.get("message") or ""
+    if not isinstance(user_msg, str):
+        raise ValueError("message must be a string")
+    history = parse_history(data.get("history"), "history")
+    session_id = resolve_session_id(data.get("session_id"), history)
+    return user_msg.strip(), history, session_id
+
+
+def parse_history(raw_history, field: str) -> List[ChatMessage]:
+    """History objects with string role/content; ValueError names `field`."""
+    raw_history = raw_history or []
+    if not isinstance(raw_history, list) or not all(isinstance(h, dict) for h in raw_history):
+        raise ValueError(f"{field} must be a list of objects")
+    history = []
+    for i, h in enumerate(raw_history):
+        role, content = h.get("role", "user"), h.get("content", "")
+        if not isinstance(role, str) or not isinstance(content, str):
+            raise ValueError(f"{field}[{i}] role and content must be strings")
+        history.append(ChatMessage(role=role, content=content))
+    return history
+
+
+def resolve_session_id(session_id, history):
+    if isinstance(session_id, str) and 0 < len(session_id) <= MAX_SESSION_ID_LEN:
+        return session_id
+    # full-history clients do not need server-side state
+    return None if history else SessionStore.new_id()
+
+
 @app.route("/api/chat", methods=["POST"])
 def api_chat():
-    data = request.get_json(force=True)
-    user_msg = data.get("message", "").strip()
-    raw_history = data.get("history", []) or []
-    history = [ChatMessage(role=h.get("role", "user"), content=h.get("content", "")) for h in raw_history]
+    try:
+        user_msg, history, session_id = parse_chat_body(request.get_json(force=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     if not user_msg:
         return jsonify({"error": "message is required"}), 400
 
-    result = orchestrator.handle_message(user_msg, history)
+    result = get_orchestrator().handle_message(user_msg, history, session_id)
     return jsonify(result)
 
 
+@app.route("/api/chat/stream", methods=["POST"])
+def api_chat_stream():
+    """
+    Server-Sent Events: "meta", then one "token" per LLM chunk, then "done".
+    """
+    try:
+        user_msg, history, session_id = parse_chat_body(request.get_json(force=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if not user_msg:
+        return jsonify({"error": "message is required"}), 400
+
+    orchestrator = get_orchestrator()
+    stream = orchestrator.handle_message_stream(user_msg, history, session_id)
+    # run up to the first event here: admission control sheds (Overloaded → 503)
+    # before any event, while the status line can still change
+    first = next(stream)
+
+    def events():
+        for ev in itertools.chain([first], stream):
+            name = ev.pop("event")
+            yield f"event: {name}\ndata: {json.dumps(ev, ensure_ascii=False)}\n\n"
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/api/chat/batch", methods=["POST"])
+def api_chat_batch():
+    """
+    Body: {"messages": [{"message": "...", "history": [...]}, ...]}; plain
+    strings are accepted as messages without history. Results keep input order;
+    items shed under load carry {"error": "overloaded", "retry_after"}, and the
+    whole request gets 503 only when every item was shed.
+    """
+    data = request.get_json(force=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "body must be a JSON object"}), 400
+    raw_items = data.get("messages") or []
+    if not isinstance(raw_items, list):
+        return jsonify({"error": "messages must be a list"}), 400
+    if not raw_items:
+        return jsonify({"error": "messages is required"}), 400
+    if len(raw_items) > config.BATCH_MAX_ITEMS:
+        return jsonify({"error": f"at most {config.BATCH_MAX_ITEMS} messages per batch"}), 413
+
+    items = []
+    for i, raw in enumerate(raw_items):
+        if isinstance(raw, str):
+            raw = {"message": raw}
+        if not isinstance(raw, dict):
+            return jsonify({"error": f"messages[{i}] must be a string or an object"}), 400
+        user_msg = raw.get("message")
+        if not isinstance(user_msg, str) or not user_msg.strip():
+            return jsonify({"error": f"messages[{i}] needs a message"}), 400
+        try:
+            history = parse_history(raw.get("history"), f"messages[{i}].history")
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        items.append((user_msg.strip(), history))
+
+    return jsonify({"results": get_orchestrator().handle_batch(items)})
+
+
+@app.route("/healthz", methods=["GET"])
+def healthz():
+    """
+    Readiness: 200 once the pipeline is built, 503 while it is still loading.
+    The first probe starts the build (servers that do not preload the app).
+    """
+    if _orchestrator is None:
+        start_build()
+        return jsonify({"status": "starting"}), 503
+    return jsonify({"status": "ready", "corpus_version": _orchestrator.corpus_version})
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    Prometheus text format: per-stage latency histograms, request counts by
+    intent/guardrail and cache hit ratios (this worker process only).
+    """
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+
+def _admin_denied():
+    """
+    None when the request may use an admin action. Admin actions are
+    disabled (404) unless BANKING_BOT_ADMIN_TOKEN is set, and then need it
+    in the X-Admin-Token header (403 otherwise).
+    """
+    if not config.ADMIN_TOKEN:
+        return jsonify({"error": "not found"}), 404
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), config.ADMIN_TOKEN):
+        return jsonify({"error": "forbidden"}), 403
+    return None
+
+
+@app.route("/warmup", methods=["POST"])
+def warmup():
+    """
+    Build the pipeline if needed and run a synthetic query through every stage.
+    ?llm=0 skips the LLM call; with the LLM (the default) this is an admin action.
+    """
+    include_llm = request.args.get("llm", "1") != "0"
+    if include_llm:
+        denied = _admin_denied()
+        if denied is not None:
+            return denied
+    timings = get_orchestrator().warmup(include_llm=include_llm)
+    return jsonify({"status": "ready", "timings_ms": timings})
+
+
+@app.route("/admin/reindex", methods=["POST"])
+def admin_reindex():
+    """
+    Re-embed only the policy files added/changed/removed since the last run
+    and swap them into the live retriever.
+
+    Applies to the worker process that serves the request ("pid"). Other
+    workers pick the change up by polling every "watch_interval_s" seconds
+    (gunicorn.conf.py turns polling on); with 0 they keep the old corpus.
+    """
+    denied = _admin_denied()
+    if denied is not None:
+        return denied
+    report = get_orchestrator().reindex()
+    report["pid"] = os.getpid()
+    report["watch_interval_s"] = config.CORPUS_WATCH_INTERVAL_S
+    return jsonify(report)
+
+
 if __name__ == "__main__":
-    import os
     port = int(os.environ.get("PORT", 8501))
     app.run(host="0.0.0.0", port=port, debug=True)
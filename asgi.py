@@ -0,0 +1,117 @@
+# asgi.py
+"""
+ASGI entry point next to the Flask app, for serving many concurrent
+conversations from one process:
+
+    uvicorn asgi:app --port 8502
+
+Routes: POST /api/chat (async pipeline), GET /healthz, GET /metrics.
+Requests shed by admission control get 503 with Retry-After.
+The pipeline is shared with app.py (built once per process).
+"""
+import asyncio
+import json
+from typing import Any, Dict, List, Tuple
+
+import app as flask_app
+from banking_bot.core import Overloaded
+from banking_bot.metrics import REGISTRY
+
+MAX_BODY_BYTES = 1024 * 1024
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY_BYTES:
+            raise ValueError("request body too large")
+        if not message.get("more_body"):
+            return body
+
+
+async def _send(send, status: int, payload: bytes, content_type: str, headers: List[Tuple[bytes, bytes]] = ()) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", content_type.encode()), *headers],
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def _send_json(send, status: int, obj: Dict[str, Any], headers: List[Tuple[bytes, bytes]] = ()) -> None:
+    await _send(send, status, json.dumps(obj, ensure_ascii=False).encode("utf-8"), "application/json", headers)
+
+
+async def _lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                await asyncio.to_thread(flask_app.get_orchestrator)
+            except Exception as e:
+                await send({"type": "lifespan.startup.failed", "message": str(e)})
+                return
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if flask_app._orchestrator is not None:
+                await flask_app._orchestrator.aclose()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send) -> None:
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    method, path = scope["method"], scope["path"]
+
+    if path == "/api/chat" and method == "POST":
+        try:
+            data = json.loads(await _read_body(receive) or b"{}")
+        except ValueError:
+            await _send_json(send, 400, {"error": "invalid JSON body"})
+            return
+        try:
+            user_msg, history, session_id = flask_app.parse_chat_body(data)
+        except ValueError as e:
+            await _send_json(send, 400, {"error": str(e)})
+            return
+        if not user_msg:
+            await _send_json(send, 400, {"error": "message is required"})
+            return
+        orchestrator = flask_app._orchestrator
+        if orchestrator is None:
+            # first request without lifespan startup: build off the event loop
+            orchestrator = await asyncio.to_thread(flask_app.get_orchestrator)
+        try:
+            result = await orchestrator.handle_message_async(user_msg, history, session_id)
+        except Overloaded as e:
+            await _send_json(
+                send,
+                503,
+                {"error": "The assistant is busy, please try again shortly.", "retry_after": e.retry_after_s},
+                [(b"retry-after", str(e.retry_after_s).encode())],
+            )
+            return
+        await _send_json(send, 200, result)
+        return
+
+    if path == "/healthz" and method == "GET":
+        orchestrator = flask_app._orchestrator
+        if orchestrator is None:
+            flask_app.start_build()  # servers run without lifespan events
+            await _send_json(send, 503, {"status": "starting"})
+        else:
+            await _send_json(send, 200, {"status": "ready", "corpus_version": orchestrator.corpus_version})
+        return
+
+    if path == "/metrics" and method == "GET":
+        await _send(send, 200, REGISTRY.render().encode("utf-8"), "text/plain; version=0.0.4")
+        return
+
+    await _send_json(send, 404, {"error": "not found"})
@@ -5,10 +5,14 @@ Banking chatbot package.
 This package contains:
 - config: global configuration and constants
 - models: dataclasses for messages, snippets, logs
+- matcher: shared one-pass keyword matcher for safety and intent
+- cache: small thread-safe in-process caches
+- forksafe: per-process values (background threads, pools) for pre-fork servers
 - safety: safety filters / guardrails
 - intent: intent classification
 - rag: retrieval-augmented generation components
 - llm: language model providers
 - logging: interaction logger
+- metrics: in-process latency histograms and counters
 - core: orchestrator and prompt builder
 """
@@ -1,4 +1,5 @@
 # banking_bot/config.py
+import os
 from typing import Dict, List
 from .models import Snippet
 
@@ -6,8 +7,120 @@ from .models import Snippet
 USE_OLLAMA: bool = False  # set True when Ollama + model ready
 OLLAMA_URL: str = "http://localhost:11434/api/generate"
 OLLAMA_MODEL: str = "llama3.2:3b"
+OLLAMA_POOL_SIZE: int = 16  # keep-alive connections per process (sync path)
+OLLAMA_ASYNC_MAX_CONNECTIONS: int = 256  # concurrent in-flight calls (async path)
+OLLAMA_CONNECT_TIMEOUT_S: float = 3.0
+OLLAMA_READ_TIMEOUT_S: float = 60.0
+OLLAMA_NUM_CTX: int = 4096  # model context window requested from Ollama
+OLLAMA_NUM_PREDICT: int = 256
+# Several Ollama nodes serving the same model, comma-separated; overrides OLLAMA_URL
+OLLAMA_URLS: List[str] = [u.strip() for u in os.environ.get("OLLAMA_URLS", "").split(",") if u.strip()]
+
+# Routing across OLLAMA_URLS (llm/router.py)
+LLM_HEDGE_ENABLED: bool = True  # duplicate a slow call to a second backend
+LLM_HEDGE_MAX: int = 1  # extra copies per call
+LLM_HEDGE_WINDOW: int = 256  # recent latencies the hedge delay (p95) is taken from
+LLM_HEDGE_MIN_SAMPLES: int = 20  # use LLM_HEDGE_DEFAULT_DELAY_MS until then
+LLM_HEDGE_DEFAULT_DELAY_MS: float = 3000.0
+LLM_HEDGE_MIN_DELAY_MS: float = 500.0
+LLM_BREAKER_FAILURES: int = 3  # consecutive failures that open a backend's circuit
+LLM_BREAKER_COOLDOWN_S: float = 10.0  # open time before a half-open probe
+
+# Prompt assembly (token counts are estimates, see prompt_builder.count_tokens)
+PROMPT_MAX_TOKENS: int = 3072  # leaves room for OLLAMA_NUM_PREDICT within OLLAMA_NUM_CTX
+PROMPT_HISTORY_TURNS: int = 6
+LLM_CONTEXT_REUSE: bool = True  # continue a session from the backend's returned context
+
+# Server-side conversation sessions
+SESSION_MAX_BYTES: int = 64 * 1024 * 1024  # estimated memory for all sessions, LRU beyond
+SESSION_IDLE_TTL_S: float = 1800.0
+SESSION_MAX_MESSAGES: int = PROMPT_HISTORY_TURNS  # only what the prompt can use is kept
+
+# Semantic answer cache (skips the LLM for near-duplicate first questions;
+# follow-ups in a conversation are never cached or served from it)
+ANSWER_CACHE_ENABLED: bool = True
+ANSWER_CACHE_THRESHOLD: float = 0.95  # min cosine similarity between query embeddings
+ANSWER_CACHE_SIZE: int = 1024
+ANSWER_CACHE_TTL_S: float = 6 * 3600.0
+
+# Admission control: LLM calls in flight per process, with a bounded wait queue;
+# requests that cannot be answered within the deadline get 503 + Retry-After.
+# Safety refusals and answer cache hits never queue.
+ADMISSION_MAX_CONCURRENT: int = 8  # 0 disables admission control
+ADMISSION_MAX_QUEUE: int = 32
+REQUEST_DEADLINE_S: float = 30.0  # per request, from arrival; 0 = wait as long as it takes
+
+# Fast path: canned intents answered from the top retrieved snippet, without
+# the LLM, when intent confidence (similarity to the intent centroid, so
+# centroid intents only) and the top retrieval score both reach the minimum.
+# Decisions are logged as extra["fast_path"].
+FAST_PATH_ENABLED: bool = True
+FAST_PATH_MIN_INTENT_SCORE: float = 0.65
+FAST_PATH_MIN_RETRIEVAL_SCORE: float = 0.6
+FAST_PATH_TEMPLATES: Dict[str, str] = {
+    "card_block": "{snippet} If you notice any transaction you did not make, report it to the bank right away.",
+    "branch_info": "{snippet} Timings can differ on local holidays, so please check with your branch if unsure.",
+}
+# fnmatch patterns for the top snippet's source (file name) per intent; the
+# fast path is skipped when the best match comes from another document
+FAST_PATH_SOURCES: Dict[str, List[str]] = {
+    "card_block": ["builtin_card_block", "*card*"],
+    "branch_info": ["builtin_branch_timings", "*branch*"],
+}
+
+# Batch chat API
+BATCH_MAX_ITEMS: int = 256
+BATCH_LLM_CONCURRENCY: int = 8  # LLM calls in flight per batch request
 
 LOG_FILE: str = "chatlogs.jsonl"
+LOG_ASYNC: bool = True  # write logs from a background thread in batches
+LOG_QUEUE_SIZE: int = 10000
+LOG_QUEUE_FULL_POLICY: str = "drop"  # "drop" | "block" when the queue is full
+LOG_FLUSH_INTERVAL_S: float = 0.5
+LOG_BATCH_MAX: int = 512
+LOG_FSYNC: str = "never"  # "never" | "batch" (fsync after every batch write)
+LOG_ROTATE_MAX_BYTES: int = 64 * 1024 * 1024  # 0 disables size-based rotation
+LOG_ROTATE_INTERVAL_S: int = 0  # e.g. 86400 for daily files; 0 disables
+LOG_SEGMENT_DIR: str = "chatlogs.segments"  # columnar copies (python -m banking_bot.logging.analytics)
+LOG_SEGMENT_MAX_ROWS: int = 1_000_000
+
+# Embeddings
+EMBED_MODEL_NAME: str = "all-MiniLM-L6-v2"
+USE_EMBED_CACHE: bool = True  # persist corpus embeddings on disk between runs
+EMBED_CACHE_DIR: str = ".embed_cache"
+EMBED_QUERY_CACHE_SIZE: int = 2048  # normalized query → vector; 0 disables
+EMBED_QUERY_CACHE_TTL_S: float = 3600.0
+EMBED_BATCHING: bool = True  # coalesce concurrent small encode calls into one model call
+EMBED_BATCH_MAX_SIZE: int = 32
+EMBED_BATCH_MAX_WAIT_MS: float = 3.0
+# Offline parallel indexing (python -m banking_bot.rag.build_index)
+INDEX_BUILD_WORKERS: int = 0  # worker processes; 0 = one per core
+INDEX_BUILD_SHARD_SIZE: int = 256  # chunks per task
+
+# Corpus ingestion
+CHUNK_TOKENS: int = 160  # paragraphs longer than this are split into token windows
+CHUNK_OVERLAP_TOKENS: int = 32
+CORPUS_WATCH_INTERVAL_S: float = 0.0  # poll data/policies for changes; 0 disables
+# required by /admin/* and /warmup with the LLM; those routes are disabled while unset
+ADMIN_TOKEN: str | None = os.environ.get("BANKING_BOT_ADMIN_TOKEN")
+
+# Retrieval index
+RETRIEVER_INDEX: str = "brute"  # "brute" (exact) | "ivf" (approximate, for large corpora) | "quantized"
+IVF_NLIST: int = 0  # number of clusters; 0 = sqrt(corpus size)
+IVF_NPROBE: int = 8  # clusters scanned per query; higher = better recall, slower
+# "quantized": compressed vectors in memory, exact rescoring from the on-disk store
+# (see bench/quant_report.py for recall vs memory of each setting)
+QUANT_DTYPE: str = "int8"  # "float16" | "int8"
+QUANT_PCA_DIM: int = 0  # project to this many dimensions first; 0 = no PCA
+QUANT_RESCORE: int = 50  # shortlist rescored with full-precision vectors; 0 = no rescoring
+
+# Hybrid retrieval (BM25 shortlist, fused with dense scores)
+RETRIEVAL_MODE: str = "dense"  # "dense" | "hybrid"
+SPARSE_CANDIDATES: int = 100  # BM25 shortlist size that is rescored densely
+HYBRID_DENSE_WEIGHT: float = 0.7
+HYBRID_SPARSE_WEIGHT: float = 0.3  # applied to BM25 scores scaled to [0, 1]
+BM25_K1: float = 1.5
+BM25_B: float = 0.75
 
 SYSTEM_PROMPT: str = """You are UNH Banking Assistant, a secure and professional banking chatbot focused on Indian retail banking.
 
@@ -45,6 +158,13 @@ SENSITIVE_KEYWORDS: List[str] = [
     "unblock my card", "change mobile number", "update phone", "update number"
 ]
 
+# Intent classification: nearest centroid on the retrieval query vector, with
+# the keyword rules below as fallback (python -m banking_bot.intent.build_centroids)
+INTENT_MODE: str = "centroid"  # "centroid" | "keywords"
+INTENT_EXAMPLES_FILE: str = os.path.join("data", "intent_examples.jsonl")
+INTENT_CENTROIDS_FILE: str = os.path.join(EMBED_CACHE_DIR, "intent_centroids.npz")
+INTENT_CENTROID_THRESHOLD: float = 0.5  # min cosine similarity; below it keywords decide
+
 # Intent keywords (very simple baseline)
 INTENT_KEYWORDS: Dict[str, List[str]] = {
     "card_block": ["block card", "lost card", "stolen card", "hotlist card", "block my debit", "lost my debit"],
@@ -64,6 +184,8 @@ REFUSAL_MSG_SENSITIVE: str = (
     "Please log in to the official mobile/online banking or contact customer support."
 )
 
+LLM_ERROR_MSG: str = "I’m experiencing technical difficulties accessing the model. Please try again later."
+
 # Default RAG snippets (RBI-style, can be replaced by real text files later)
 DEFAULT_SNIPPETS: List[Snippet] = [
     Snippet(
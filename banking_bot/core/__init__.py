@@ -1,4 +1,7 @@
 # banking_bot/core/__init__.py
 from .orchestrator import ChatOrchestrator, build_orchestrator
+from .admission import AdmissionController, Overloaded
+from .fast_path import FastPathResponder
+from .session_store import SessionStore
 
-__all__ = ["ChatOrchestrator", "build_orchestrator"]
+__all__ = ["ChatOrchestrator", "build_orchestrator", "AdmissionController", "Overloaded", "FastPathResponder", "SessionStore"]
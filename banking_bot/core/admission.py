@@ -0,0 +1,189 @@
+# banking_bot/core/admission.py
+from __future__ import annotations
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Deque, Iterator, Optional
+from ..metrics import MetricsRegistry, REGISTRY
+
+
+class Overloaded(Exception):
+    """
+    Raised when a request is shed; the HTTP layer answers 503 with
+    Retry-After: retry_after_s.
+    """
+
+    def __init__(self, reason: str, retry_after_s: int) -> None:
+        super().__init__(f"overloaded ({reason})")
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+class _Waiter:
+    # a queued thread (event) or coroutine (future on its loop)
+    __slots__ = ("event", "loop", "future", "granted")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        self.loop = loop
+        self.future = loop.create_future() if loop is not None else None
+        self.event = threading.Event() if loop is None else None
+        self.granted = False
+
+    def wake(self) -> None:
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class AdmissionController:
+    """
+    Single-responsibility: bound how many LLM calls run at once.
+
+    Up to `max_concurrent` callers hold a slot; up to `max_queue` more wait
+    in FIFO order. A caller is shed (Overloaded) instead of queued when the
+    queue is full or when the expected wait plus service time (from an EWMA
+    of recent slot hold times) already exceeds its deadline, and while
+    waiting when the deadline passes. Threads and coroutines share the same
+    slots and queue.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        self._max_concurrent = max(1, max_concurrent)
+        self._max_queue = max(0, max_queue)
+        self._in_flight = 0
+        self._waiters: Deque[_Waiter] = deque()
+        self._service_s = 0.0  # EWMA of slot hold time
+        self._lock = threading.Lock()
+        self._init_metrics(metrics or REGISTRY)
+
+    def _init_metrics(self, registry: MetricsRegistry) -> None:
+        self._m_shed = registry.counter("admission_shed_total", "Requests shed with 503 by reason.", ["reason"])
+        registry.gauge_callback(
+            "admission_queue_depth", "Requests waiting for an LLM slot.", [], lambda: {(): len(self._waiters)}
+        )
+        registry.gauge_callback(
+            "admission_in_flight", "LLM calls holding a slot.", [], lambda: {(): self._in_flight}
+        )
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "service_ms": round(self._service_s * 1000, 1),
+        }
+
+    # --- slot bookkeeping (callers hold self._lock) ---------------------------
+
+    def _expected_wait_s(self, position: int) -> float:
+        # everyone ahead, plus ourselves, drains through max_concurrent slots
+        return (position + 1) * self._service_s / self._max_concurrent
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self._expected_wait_s(len(self._waiters))))
+
+    def _shed(self, reason: str) -> Overloaded:
+        self._m_shed.inc(reason=reason)
+        return Overloaded(reason, self._retry_after())
+
+    def _try_enter(self, deadline: Optional[float], loop: asyncio.AbstractEventLoop | None) -> Optional[_Waiter]:
+        """None when a slot was taken right away, else the queued waiter."""
+        if self._in_flight < self._max_concurrent and not self._waiters:
+            self._in_flight += 1
+            return None
+        if len(self._waiters) >= self._max_queue:
+            raise self._shed("queue_full")
+        if deadline is not None:
+            expected = self._expected_wait_s(len(self._waiters)) + self._service_s
+            if time.perf_counter() + expected > deadline:
+                raise self._shed("deadline")
+        waiter = _Waiter(loop)
+        self._waiters.append(waiter)
+        return waiter
+
+    def _give_up(self, waiter: _Waiter) -> bool:
+        """Leave the queue; True when the slot was granted in the meantime."""
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            return False
+
+    def release(self, held_s: Optional[float] = None) -> None:
+        with self._lock:
+            if held_s is not None:
+                self._service_s = held_s if not self._service_s else 0.8 * self._service_s + 0.2 * held_s
+            if self._waiters:
+                # hand the slot straight to the next waiter
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                waiter.wake()
+            else:
+                self._in_flight -= 1
+
+    # --- acquire -----------------------------------------------------------------
+
+    def acquire(self, deadline: Optional[float] = None) -> float:
+        """
+        Take a slot, waiting at most until `deadline` (time.perf_counter()
+        value). Returns the seconds spent queued; raises Overloaded.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            waiter = self._try_enter(deadline, None)
+        if waiter is None:
+            return 0.0
+        timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+        if waiter.event.wait(timeout) or self._give_up(waiter):
+            return time.perf_counter() - started
+        with self._lock:
+            raise self._shed("timeout")
+
+    async def acquire_async(self, deadline: Optional[float] = None) -> float:
+        started = time.perf_counter()
+        with self._lock:
+            waiter = self._try_enter(deadline, asyncio.get_running_loop())
+        if waiter is None:
+            return 0.0
+        timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+        try:
+            await asyncio.wait({waiter.future}, timeout=timeout)
+        except asyncio.CancelledError:
+            # client went away: give back a slot that was already handed over
+            if self._give_up(waiter):
+                self.release()
+            raise
+        if waiter.granted or self._give_up(waiter):
+            return time.perf_counter() - started
+        with self._lock:
+            raise self._shed("timeout")
+
+    @contextmanager
+    def slot(self, deadline: Optional[float] = None) -> Iterator[float]:
+        waited = self.acquire(deadline)
+        started = time.perf_counter()
+        try:
+            yield waited
+        finally:
+            self.release(time.perf_counter() - started)
+
+    @asynccontextmanager
+    async def aslot(self, deadline: Optional[float] = None) -> AsyncIterator[float]:
+        waited = await self.acquire_async(deadline)
+        started = time.perf_counter()
+        try:
+            yield waited
+        finally:
+            self.release(time.perf_counter() - started)
@@ -0,0 +1,102 @@
+# banking_bot/core/answer_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+
+class SemanticAnswerCache:
+    """
+    Single-responsibility: reuse LLM answers for near-duplicate questions.
+
+    An entry is keyed by the retrieved snippet ids and the query embedding.
+    A lookup hits when the retrieved context is identical and the cosine
+    similarity of the query vectors is at least `threshold`. Entries are
+    evicted LRU / after `ttl_s`, and everything is dropped when the corpus
+    version changes.
+    """
+
+    def __init__(self, threshold: float, max_size: int, ttl_s: float | None = None) -> None:
+        self._threshold = threshold
+        self._max_size = max_size
+        self._ttl_s = ttl_s
+        self._entries: "OrderedDict[int, Tuple[Tuple[str, ...], np.ndarray, str, float]]" = OrderedDict()
+        self._by_context: Dict[Tuple[str, ...], List[int]] = {}
+        self._next_id = 0
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, q_vec: np.ndarray, doc_ids: Sequence[str], corpus_version: str) -> Optional[str]:
+        key = tuple(doc_ids)
+        with self._lock:
+            self._check_version(corpus_version)
+            ids = self._by_context.get(key)
+            if not ids:
+                self.misses += 1
+                return None
+
+            now = time.monotonic()
+            for entry_id in [i for i in ids if self._expired(i, now)]:
+                self._remove(entry_id)
+            ids = self._by_context.get(key)
+            if not ids:
+                self.misses += 1
+                return None
+
+            sims = np.stack([self._entries[i][1] for i in ids]) @ q_vec
+            best = int(np.argmax(sims))
+            if sims[best] < self._threshold:
+                self.misses += 1
+                return None
+
+            entry_id = ids[best]
+            self._entries.move_to_end(entry_id)
+            self.hits += 1
+            return self._entries[entry_id][2]
+
+    def put(self, q_vec: np.ndarray, doc_ids: Sequence[str], corpus_version: str, answer: str) -> None:
+        if self._max_size <= 0:
+            return
+        key = tuple(doc_ids)
+        with self._lock:
+            self._check_version(corpus_version)
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (key, np.array(q_vec, dtype=np.float32), answer, time.monotonic())
+            self._by_context.setdefault(key, []).append(entry_id)
+            while len(self._entries) > self._max_size:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_context.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _check_version(self, corpus_version: str) -> None:
+        if corpus_version != self._version:
+            self._entries.clear()
+            self._by_context.clear()
+            self._version = corpus_version
+
+    def _expired(self, entry_id: int, now: float) -> bool:
+        return self._ttl_s is not None and now - self._entries[entry_id][3] > self._ttl_s
+
+    def _remove(self, entry_id: int) -> None:
+        key = self._entries.pop(entry_id)[0]
+        ids = self._by_context[key]
+        ids.remove(entry_id)
+        if not ids:
+            del self._by_context[key]
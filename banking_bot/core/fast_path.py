@@ -0,0 +1,66 @@
+# banking_bot/core/fast_path.py
+from fnmatch import fnmatch
+from typing import Any, Dict, List, Optional, Tuple
+from ..models import Snippet
+from .. import config
+
+
+class FastPathResponder:
+    """
+    Single-responsibility: answer canned intents straight from the top
+    retrieved snippet, without an LLM call.
+
+    An intent is eligible when it has a template; the answer is the template
+    filled with the top snippet's text, used only when both the intent
+    confidence and the top retrieval score reach their thresholds and the
+    snippet comes from one of the intent's sources.
+    """
+
+    def __init__(
+        self,
+        templates: Dict[str, str] | None = None,
+        min_intent_score: float | None = None,
+        min_retrieval_score: float | None = None,
+        sources: Dict[str, List[str]] | None = None,
+    ) -> None:
+        self._templates = dict(config.FAST_PATH_TEMPLATES if templates is None else templates)
+        self._sources = dict(config.FAST_PATH_SOURCES if sources is None else sources)
+        self._min_intent_score = (
+            config.FAST_PATH_MIN_INTENT_SCORE if min_intent_score is None else min_intent_score
+        )
+        self._min_retrieval_score = (
+            config.FAST_PATH_MIN_RETRIEVAL_SCORE if min_retrieval_score is None else min_retrieval_score
+        )
+
+    def eligible(self, intent: str) -> bool:
+        return intent in self._templates
+
+    def answer(
+        self, intent: str, intent_score: float, context_snippets: List[Snippet]
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Return (answer or None, decision). The decision records why the fast
+        path was or was not taken, for InteractionLog.extra["fast_path"].
+        """
+        top = context_snippets[0] if context_snippets else None
+        decision: Dict[str, Any] = {
+            "used": False,
+            "intent_score": round(intent_score, 4),
+            "top_score": round(top.score, 4) if top is not None else None,
+            "snippet": top.id if top is not None else None,
+            "source": top.source if top is not None else None,
+        }
+        if intent_score < self._min_intent_score:
+            decision["reason"] = "intent_score"
+        elif top is None or top.score < self._min_retrieval_score:
+            decision["reason"] = "retrieval_score"
+        elif not self._from_source(intent, top):
+            decision["reason"] = "source"
+        else:
+            decision["used"] = True
+            return self._templates[intent].format(snippet=top.text.strip()), decision
+        return None, decision
+
+    def _from_source(self, intent: str, snippet: Snippet) -> bool:
+        # an intent without source patterns never answers from a snippet
+        return bool(snippet.source) and any(fnmatch(snippet.source, p) for p in self._sources.get(intent, []))
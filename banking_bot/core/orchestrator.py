@@ -1,16 +1,45 @@
 # banking_bot/core/orchestrator.py
+import asyncio
 import time
 import uuid
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import List, Dict, Any, AsyncIterator, Callable, Iterator, Optional, Tuple
 
-from ..models import ChatMessage, Snippet, InteractionLog
+import numpy as np
+
+from ..models import ChatMessage, Snippet, SafetyResult, InteractionLog, LLMResult
 from .. import config
 from ..safety import SafetyFilter
-from ..intent import IntentClassifier
-from ..rag import load_policy_snippets, EmbeddingProvider, Retriever
+from ..intent import IntentClassifier, load_or_build_centroids
+from ..rag import load_policy_snippets, EmbeddingProvider, EmbeddingStore, Retriever, CorpusIngestor
 from ..llm import build_llm_provider, LLMProvider
 from ..logging import InteractionLogger
-from .prompt_builder import build_prompt
+from ..metrics import MetricsRegistry, StageTimer, REGISTRY
+from .admission import AdmissionController, Overloaded
+from .fast_path import FastPathResponder
+from .prompt_builder import build_prompt, build_followup_prompt, count_tokens
+from .answer_cache import SemanticAnswerCache
+from .session_store import SessionStore
+
+
+class _Turn:
+    """
+    Per-request state threaded through the pipeline stages.
+    """
+
+    def __init__(self, user_msg: str, path: str, session_id: str | None = None) -> None:
+        self.id = str(uuid.uuid4())
+        self.msg = user_msg.strip()
+        self.path = path  # "chat" | "stream" | "batch" | "async"
+        self.session_id = session_id
+        self.timer = StageTimer()
+        self.started = time.perf_counter()
+        self.cacheable = False  # set by _lookup_answer: no conversation before this turn
+        self.extra: Dict[str, Any] = {}
+
+    def latency_ms(self) -> int:
+        return int((time.perf_counter() - self.started) * 1000)
 
 
 class ChatOrchestrator:
@@ -23,6 +52,14 @@ class ChatOrchestrator:
     - Retriever
     - LLMProvider
     - InteractionLogger
+    - SemanticAnswerCache (optional)
+    - SessionStore (server-side history and LLM context per session id)
+    - AdmissionController (optional, bounds concurrent LLM calls)
+    - FastPathResponder (optional, answers canned intents without the LLM)
+    - CorpusIngestor (optional, for hot reindexing)
+
+    Every stage is timed; the breakdown goes to InteractionLog.extra
+    ["timings_ms"] and to the in-process metrics registry.
     """
 
     def __init__(
@@ -32,98 +69,649 @@ class ChatOrchestrator:
         retriever: Retriever,
         llm: LLMProvider,
         logger: InteractionLogger,
+        answer_cache: SemanticAnswerCache | None = None,
+        ingestor: CorpusIngestor | None = None,
+        metrics: MetricsRegistry | None = None,
+        sessions: SessionStore | None = None,
+        admission: AdmissionController | None = None,
+        fast_path: FastPathResponder | None = None,
     ) -> None:
         self._safety = safety_filter
         self._intent_classifier = intent_classifier
         self._retriever = retriever
         self._llm = llm
         self._logger = logger
+        self._answer_cache = answer_cache
+        self._ingestor = ingestor
+        self._sessions = sessions or SessionStore(
+            config.SESSION_MAX_BYTES, config.SESSION_IDLE_TTL_S, config.SESSION_MAX_MESSAGES
+        )
+        self._admission = admission
+        self._fast_path = fast_path
+        self._init_metrics(metrics or REGISTRY)
 
-    def handle_message(self, user_msg: str, history: List[ChatMessage]) -> Dict[str, Any]:
-        t0 = time.time()
-        interaction_id = str(uuid.uuid4())
-        msg = user_msg.strip()
+    def _init_metrics(self, registry: MetricsRegistry) -> None:
+        self._m_stage = registry.histogram(
+            "chat_stage_latency_ms", "Latency of each pipeline stage in milliseconds.", ["stage"]
+        )
+        self._m_latency = registry.histogram(
+            "chat_request_latency_ms", "End-to-end request latency in milliseconds.", ["path"]
+        )
+        self._m_requests = registry.counter(
+            "chat_requests_total", "Handled messages by intent and guardrail.", ["intent", "guardrail"]
+        )
+        self._m_fast_path = registry.counter(
+            "chat_fast_path_total", "Fast-path decisions for eligible intents.", ["intent", "used"]
+        )
+
+        def cache_hit_ratio() -> Dict[Tuple[str, ...], float]:
+            values = {("embedding_query",): self._retriever.embedder.cache_stats()["hit_rate"]}
+            if self._answer_cache is not None:
+                values[("answer",)] = self._answer_cache.stats()["hit_rate"]
+            return values
+
+        def cache_entries() -> Dict[Tuple[str, ...], float]:
+            values = {
+                ("embedding_query",): self._retriever.embedder.cache_stats()["size"],
+                ("sessions",): len(self._sessions),
+            }
+            if self._answer_cache is not None:
+                values[("answer",)] = self._answer_cache.stats()["size"]
+            return values
+
+        registry.gauge_callback("cache_hit_ratio", "Hit ratio of in-process caches.", ["cache"], cache_hit_ratio)
+        registry.gauge_callback("cache_entries", "Entries held by in-process caches.", ["cache"], cache_entries)
+        registry.gauge_callback(
+            "session_store_bytes",
+            "Estimated memory held by conversation sessions.",
+            [],
+            lambda: {(): self._sessions.stats()["bytes"]},
+        )
+        registry.gauge_callback(
+            "embedding_batch_avg_size",
+            "Average micro-batch size of embedding calls.",
+            [],
+            lambda: {(): self._retriever.embedder.batch_stats().get("avg_batch_size", 0.0)},
+        )
+
+    def handle_message(
+        self, user_msg: str, history: List[ChatMessage], session_id: str | None = None
+    ) -> Dict[str, Any]:
+        turn = _Turn(user_msg, "chat", session_id)
+        msg = turn.msg
+        timer = turn.timer
+        history = self._history(turn, history)
 
         # 1) Safety
-        safety_result = self._safety.check(msg)
+        with timer.stage("safety"):
+            safety_result = self._safety.check(msg)
         if not safety_result.allowed:
-            latency = int((time.time() - t0) * 1000)
-            log_entry = InteractionLog(
-                id=interaction_id,
-                user_msg=msg,
-                intent=safety_result.category,
-                response=safety_result.message or "",
-                model=config.OLLAMA_MODEL if config.USE_OLLAMA else "dummy",
-                latency_ms=latency,
-                risk_flag=bool(safety_result.flags and safety_result.flags.get("risky")),
-                sensitive_flag=bool(safety_result.flags and safety_result.flags.get("sensitive")),
-                retrieved_doc_ids=[],
-                guardrail_triggered=safety_result.category,
-            )
-            self._logger.log(log_entry)
+            return self._refuse(turn, safety_result)
+
+        # 2) Query embedding, shared by intent classification and retrieval
+        with timer.stage("embed"):
+            q_vec = self._retriever.embed_query(msg)
+
+        # 3) Intent (nearest centroid; keyword fallback reuses the safety scan)
+        with timer.stage("intent"):
+            intent = self._classify(turn, safety_result, q_vec)
+
+        # 4) Retrieval
+        with timer.stage("search"):
+            context_snippets: List[Snippet] = self._retriever.search(q_vec, top_k=3, query=msg)
+
+        # 5) Answer cache, else Prompt + LLM
+        return self._complete(turn, history, intent, q_vec, context_snippets)
+
+    async def handle_message_async(
+        self, user_msg: str, history: List[ChatMessage], session_id: str | None = None
+    ) -> Dict[str, Any]:
+        """
+        Async counterpart of handle_message with the same result.
+
+        Embedding and search run in the default executor (they are CPU-bound);
+        intent classification on the query vector overlaps with the search,
+        and the LLM call is awaited on the provider's async API, so the event
+        loop can serve many conversations at once.
+        """
+        turn = _Turn(user_msg, "async", session_id)
+        msg = turn.msg
+        loop = asyncio.get_running_loop()
+        history = self._history(turn, history)
+
+        with turn.timer.stage("safety"):
+            safety_result = self._safety.check(msg)
+        if not safety_result.allowed:
+            return self._refuse(turn, safety_result)
+
+        q_vec = await loop.run_in_executor(None, self._timed, turn, "embed", self._retriever.embed_query, msg)
+        search = loop.run_in_executor(None, self._timed, turn, "search", self._retriever.search, q_vec, 3, msg)
+        intent = self._timed(turn, "intent", self._classify, turn, safety_result, q_vec)
+        context_snippets: List[Snippet] = await search
+
+        answer = self._lookup_answer(turn, history, intent, q_vec, context_snippets)
+        if answer is None:
+            prompt, llm_context = self._build_prompt(turn, history, context_snippets)
+            async with self._allm_slot(turn):
+                started = time.perf_counter()
+                llm_result = await self._llm.acomplete(prompt, llm_context)
+                turn.timer.add("llm", (time.perf_counter() - started) * 1000)
+            self._remember_context(turn, llm_result)
+            answer = llm_result.text
+            self._store_answer(turn, q_vec, context_snippets, llm_result)
+
+        return self._answer(turn, intent, answer, context_snippets)
+
+    def handle_batch(self, items: List[Tuple[str, List[ChatMessage]]]) -> List[Dict[str, Any]]:
+        """
+        Answer many (message, history) pairs; results come back in input order
+        and match what handle_message returns for each item.
+
+        All allowed messages are embedded with one encode call and scored
+        against the corpus together; LLM calls run concurrently, at most
+        config.BATCH_LLM_CONCURRENCY at a time. An item shed by admission
+        control gets {"id", "error": "overloaded", "retry_after"} instead of
+        an answer; Overloaded is raised only when every item was shed.
+        """
+        turns = [_Turn(m, "batch") for m, _ in items]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        shed: List[Overloaded] = []
+
+        safety_results: List[SafetyResult] = []
+        for turn in turns:
+            with turn.timer.stage("safety"):
+                safety_results.append(self._safety.check(turn.msg))
+
+        allowed: List[int] = []
+        for i, safety_result in enumerate(safety_results):
+            if safety_result.allowed:
+                allowed.append(i)
+            else:
+                results[i] = self._refuse(turns[i], safety_result)
+
+        if allowed:
+            allowed_msgs = [turns[i].msg for i in allowed]
+            # batch-wide stages are charged to every item in the batch
+            batch_timer = StageTimer()
+            with batch_timer.stage("embed"):
+                q_mat = self._retriever.embed_queries(allowed_msgs)
+            with batch_timer.stage("search"):
+                snippet_lists = self._retriever.search_many(q_mat, allowed_msgs, top_k=3)
+
+            def run(j: int) -> Dict[str, Any]:
+                i = allowed[j]
+                turn = turns[i]
+                for stage, ms in batch_timer.timings.items():
+                    turn.timer.add(stage, ms)
+                with turn.timer.stage("intent"):
+                    intent = self._classify(turn, safety_results[i], q_mat[j])
+                try:
+                    return self._complete(turn, items[i][1], intent, q_mat[j], snippet_lists[j])
+                except Overloaded as e:
+                    shed.append(e)
+                    return {"id": turn.id, "error": "overloaded", "retry_after": e.retry_after_s}
+
+            workers = max(1, min(config.BATCH_LLM_CONCURRENCY, len(allowed)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for i, result in zip(allowed, pool.map(run, range(len(allowed)))):
+                    results[i] = result
+            if len(shed) == len(items):
+                raise Overloaded(shed[0].reason, max(e.retry_after_s for e in shed))
+
+        return results
+
+    def handle_message_stream(
+        self, user_msg: str, history: List[ChatMessage], session_id: str | None = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming variant of handle_message. Yields events:
+        - {"event": "meta", "id", "intent", "sources"} once retrieval is done
+        - {"event": "token", "text"} for each chunk produced by the LLM
+        - {"event": "done", ...} with the same payload handle_message returns
+
+        A single InteractionLog is written when the stream ends, also if the
+        client disconnects early.
+        """
+        turn = _Turn(user_msg, "stream", session_id)
+        msg = turn.msg
+        timer = turn.timer
+        history = self._history(turn, history)
+
+        with timer.stage("safety"):
+            safety_result = self._safety.check(msg)
+        if not safety_result.allowed:
+            yield {"event": "meta", "id": turn.id, "session_id": session_id, "intent": safety_result.category, "sources": []}
+            yield {"event": "token", "text": safety_result.message or ""}
+            yield {"event": "done", **self._refuse(turn, safety_result)}
+            return
 
-            return {
-                "id": interaction_id,
-                "intent": safety_result.category,
-                "response": safety_result.message,
-                "sources": [],
-                "latency_ms": latency,
+        with timer.stage("embed"):
+            q_vec = self._retriever.embed_query(msg)
+        with timer.stage("intent"):
+            intent = self._classify(turn, safety_result, q_vec)
+        with timer.stage("search"):
+            context_snippets: List[Snippet] = self._retriever.search(q_vec, top_k=3, query=msg)
+
+        cached = self._lookup_answer(turn, history, intent, q_vec, context_snippets)
+        # queue before the first event, so a shed request can still get a 503
+        admitted = cached is None and self._admit(turn)
+        slot_started = time.perf_counter()
+        turn.extra["streamed"] = True
+        chunks: List[str] = []
+        completed = False
+        llm_result = LLMResult(text="")
+        try:
+            yield {
+                "event": "meta",
+                "id": turn.id,
+                "session_id": session_id,
+                "intent": intent,
+                "sources": self._sources(context_snippets),
             }
+            if cached is not None:
+                stream = iter([cached])
+            else:
+                prompt, llm_context = self._build_prompt(turn, history, context_snippets)
+                stream = self._llm.stream(prompt, llm_context, llm_result)
+            llm_started = time.perf_counter()
+            for chunk in stream:
+                if not chunks and cached is None:
+                    timer.add("llm_first_token", (time.perf_counter() - llm_started) * 1000)
+                chunks.append(chunk)
+                yield {"event": "token", "text": chunk}
+            if cached is None:
+                timer.add("llm", (time.perf_counter() - llm_started) * 1000)
+                self._remember_context(turn, llm_result)
+                self._store_answer(turn, q_vec, context_snippets, llm_result)
+            completed = True
+        finally:
+            if admitted:
+                self._admission.release(time.perf_counter() - slot_started)
+            if not completed:
+                turn.extra["aborted"] = True
+            result = self._answer(turn, intent, "".join(chunks).strip(), context_snippets)
+        yield {"event": "done", **result}
+
+    @property
+    def corpus_version(self) -> str:
+        return self._retriever.version
+
+    def warmup(self, include_llm: bool = True) -> Dict[str, int]:
+        """
+        Push a synthetic query through every stage so models, indexes and
+        connections are loaded before real traffic. Nothing is logged or
+        cached as an answer. Returns per-stage timings in ms.
+        """
+        msg = "How do I block my lost debit card?"
+        timings: Dict[str, int] = {}
+        t = time.perf_counter()
+
+        def lap(stage: str) -> None:
+            nonlocal t
+            now = time.perf_counter()
+            timings[stage] = int((now - t) * 1000)
+            t = now
+
+        safety_result = self._safety.check(msg)
+        lap("safety")
+        q_vec = self._retriever.embed_query(msg)
+        lap("embed")
+        self._intent_classifier.classify_with_score(msg, q_vec, safety_result.keyword_hits)
+        lap("intent")
+        context_snippets = self._retriever.search(q_vec, top_k=3, query=msg)
+        lap("search")
+        prompt = build_prompt(msg, [], context_snippets)
+        lap("prompt")
+        if include_llm:
+            self._llm.generate(prompt)
+            lap("llm")
+        return timings
+
+    def preload(self) -> None:
+        """
+        Load the embedding model weights without running them, for a pre-fork
+        master: inference there would start thread pools that do not survive
+        fork(). Run warmup() in each worker instead.
+        """
+        self._retriever.embedder.load()
+
+    def after_fork(self) -> None:
+        """
+        Called in each worker after a pre-fork server forked the process:
+        background threads and network connections do not survive fork().
+        """
+        self._llm.after_fork()
+        if self._ingestor is not None and config.CORPUS_WATCH_INTERVAL_S > 0:
+            self._ingestor.start_watching(config.CORPUS_WATCH_INTERVAL_S)
+
+    async def aclose(self) -> None:
+        """
+        Close async LLM connections when an ASGI server shuts down.
+        """
+        await self._llm.aclose()
+
+    def reindex(self) -> Dict[str, List[str]]:
+        """
+        Pick up added/changed/removed policy files without a restart.
+        """
+        if self._ingestor is None:
+            return {"added": [], "changed": [], "removed": []}
+        return self._ingestor.sync()
+
+    def _classify(self, turn: _Turn, safety_result: SafetyResult, q_vec: np.ndarray) -> str:
+        intent, score, intent_keywords = self._intent_classifier.classify_with_score(
+            turn.msg, q_vec, safety_result.keyword_hits
+        )
+        turn.extra["intent_keywords"] = intent_keywords
+        turn.extra["intent_score"] = round(score, 4)
+        return intent
+
+    def _complete(
+        self,
+        turn: _Turn,
+        history: List[ChatMessage],
+        intent: str,
+        q_vec: np.ndarray,
+        context_snippets: List[Snippet],
+    ) -> Dict[str, Any]:
+        timer = turn.timer
+        answer = self._lookup_answer(turn, history, intent, q_vec, context_snippets)
+        if answer is None:
+            prompt, llm_context = self._build_prompt(turn, history, context_snippets)
+            with self._llm_slot(turn), timer.stage("llm"):
+                llm_result = self._llm.complete(prompt, llm_context)
+            self._remember_context(turn, llm_result)
+            answer = llm_result.text
+            self._store_answer(turn, q_vec, context_snippets, llm_result)
+
+        return self._answer(turn, intent, answer, context_snippets)
+
+    def _deadline(self, turn: _Turn) -> Optional[float]:
+        return turn.started + config.REQUEST_DEADLINE_S if config.REQUEST_DEADLINE_S > 0 else None
+
+    def _admit(self, turn: _Turn) -> bool:
+        """
+        Wait for an LLM slot (raises Overloaded when shed). False when there
+        is no admission control, i.e. nothing to release.
+        """
+        if self._admission is None:
+            return False
+        waited = self._admission.acquire(self._deadline(turn))
+        turn.timer.add("queue", waited * 1000)
+        return True
+
+    @contextmanager
+    def _llm_slot(self, turn: _Turn) -> Iterator[None]:
+        if not self._admit(turn):
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._admission.release(time.perf_counter() - started)
+
+    @asynccontextmanager
+    async def _allm_slot(self, turn: _Turn) -> AsyncIterator[None]:
+        if self._admission is None:
+            yield
+            return
+        async with self._admission.aslot(self._deadline(turn)) as waited:
+            turn.timer.add("queue", waited * 1000)
+            yield
+
+    @staticmethod
+    def _timed(turn: _Turn, stage: str, fn: Callable[..., Any], *args: Any) -> Any:
+        # thread-safe alternative to timer.stage() for stages that run concurrently
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            turn.timer.add(stage, (time.perf_counter() - started) * 1000)
+
+    def _lookup_answer(
+        self,
+        turn: _Turn,
+        history: List[ChatMessage],
+        intent: str,
+        q_vec: np.ndarray,
+        context_snippets: List[Snippet],
+    ) -> Optional[str]:
+        """
+        An answer that needs no LLM call: the fast path for canned intents,
+        else the semantic answer cache. None when the LLM has to answer.
+        """
+        # the cache key is the message alone: answers shaped by a conversation
+        # must not be served to (or taken from) other users
+        turn.cacheable = self._standalone(turn, history)
+        answer = self._fast_answer(turn, intent, context_snippets)
+        if answer is None:
+            if turn.cacheable:
+                with turn.timer.stage("cache"):
+                    answer = self._cached_answer(q_vec, context_snippets)
+            turn.extra["cache_hit"] = answer is not None
+        if answer is not None and turn.session_id:
+            # the backend context no longer covers the conversation
+            self._sessions.set_context(turn.session_id, None)
+        return answer
+
+    def _standalone(self, turn: _Turn, history: List[ChatMessage]) -> bool:
+        """True when the answer depends on the new message only."""
+        turns = [m for m in history if m.role in ("user", "assistant")]
+        # clients may send the current message as the last history entry
+        if turns and turns[-1].role == "user" and turns[-1].content.strip() == turn.msg:
+            turns.pop()
+        return not turns and self._session_context(turn) is None
 
-        # 2) Intent
-        intent = self._intent_classifier.classify(msg)
+    def _fast_answer(self, turn: _Turn, intent: str, context_snippets: List[Snippet]) -> Optional[str]:
+        if self._fast_path is None or not self._fast_path.eligible(intent):
+            return None
+        answer, decision = self._fast_path.answer(intent, turn.extra.get("intent_score", 0.0), context_snippets)
+        turn.extra["fast_path"] = decision
+        self._m_fast_path.inc(intent=intent, used=str(decision["used"]).lower())
+        return answer
 
-        # 3) Retrieval
-        context_snippets: List[Snippet] = self._retriever.retrieve(msg, top_k=3)
+    def _build_prompt(
+        self, turn: _Turn, history: List[ChatMessage], context_snippets: List[Snippet]
+    ) -> Tuple[str, Optional[List[int]]]:
+        """
+        Prompt for the LLM, and the backend context to continue from. When the
+        session has a saved context that still fits the token budget, only the
+        new turn is sent and the backend skips prefill of everything before it.
+        """
+        with turn.timer.stage("prompt"):
+            llm_context = self._session_context(turn)
+            if llm_context is not None:
+                prompt = build_followup_prompt(turn.msg, context_snippets)
+                prompt_tokens = count_tokens(prompt)
+                if len(llm_context) + prompt_tokens <= config.PROMPT_MAX_TOKENS:
+                    turn.extra["prompt_tokens"] = prompt_tokens
+                    turn.extra["llm_context_tokens"] = len(llm_context)
+                    return prompt, llm_context.tolist()
+                # conversation outgrew the budget: start over from a trimmed full prompt
+                self._sessions.set_context(turn.session_id, None)
+            prompt = build_prompt(turn.msg, history, context_snippets)
+            turn.extra["prompt_tokens"] = count_tokens(prompt)
+        return prompt, None
 
-        # 4) Prompt + LLM
-        prompt = build_prompt(msg, history, context_snippets)
-        answer = self._llm.generate(prompt)
+    def _history(self, turn: _Turn, history: List[ChatMessage]) -> List[ChatMessage]:
+        """
+        Conversation so far. Clients of a session may send only the new
+        message, and the history comes from the session store. Clients that
+        also send the conversation are the source of truth: the session is
+        brought in line with it, since with several worker processes the
+        previous turns may have been answered by another one.
+        """
+        if not turn.session_id:
+            return history
+        if not history:
+            return self._sessions.history(turn.session_id)
+        if not any(m.role == "assistant" for m in history):
+            # the client started a new conversation under the same session id
+            self._sessions.reset(turn.session_id)
+        else:
+            self._sessions.sync(turn.session_id, history)
+        return history
 
-        latency = int((time.time() - t0) * 1000)
+    def _session_context(self, turn: _Turn) -> Optional[np.ndarray]:
+        if not config.LLM_CONTEXT_REUSE or not turn.session_id:
+            return None
+        return self._sessions.context(turn.session_id)
+
+    def _remember_context(self, turn: _Turn, llm_result: LLMResult) -> None:
+        if llm_result.backend:
+            turn.extra["llm_backend"] = llm_result.backend
+        if llm_result.failed:
+            turn.extra["llm_failed"] = True
+        if not config.LLM_CONTEXT_REUSE or not turn.session_id:
+            return
+        if llm_result.context and not llm_result.failed:
+            # int32 array: a fraction of the size of a list of Python ints
+            self._sessions.set_context(turn.session_id, np.asarray(llm_result.context, dtype=np.int32))
+        else:
+            self._sessions.set_context(turn.session_id, None)
+
+    def _record_turn(self, turn: _Turn, answer: str) -> None:
+        # an aborted stream or failed LLM call never reached the user in full
+        if turn.session_id and not turn.extra.get("aborted") and not turn.extra.get("llm_failed"):
+            self._sessions.append(turn.session_id, turn.msg, answer)
+
+    def _cached_answer(self, q_vec: np.ndarray, context_snippets: List[Snippet]) -> Optional[str]:
+        if self._answer_cache is None:
+            return None
+        return self._answer_cache.get(q_vec, [s.id for s in context_snippets], self._retriever.version)
+
+    def _store_answer(
+        self, turn: _Turn, q_vec: np.ndarray, context_snippets: List[Snippet], llm_result: LLMResult
+    ) -> None:
+        # never cache failures, including streams that broke off mid-answer,
+        # nor answers to follow-ups
+        if self._answer_cache is None or not turn.cacheable or llm_result.failed or not llm_result.text:
+            return
+        self._answer_cache.put(q_vec, [s.id for s in context_snippets], self._retriever.version, llm_result.text)
+
+    def _refuse(self, turn: _Turn, safety_result: SafetyResult) -> Dict[str, Any]:
+        latency = turn.latency_ms()
+        turn.extra["matched_keywords"] = (safety_result.keyword_hits or {}).get(safety_result.category, [])
+        turn.extra["timings_ms"] = turn.timer.rounded()
+        log_entry = InteractionLog(
+            id=turn.id,
+            user_msg=turn.msg,
+            intent=safety_result.category,
+            response=safety_result.message or "",
+            model=self._model_name(),
+            latency_ms=latency,
+            risk_flag=bool(safety_result.flags and safety_result.flags.get("risky")),
+            sensitive_flag=bool(safety_result.flags and safety_result.flags.get("sensitive")),
+            retrieved_doc_ids=[],
+            guardrail_triggered=safety_result.category,
+            extra=turn.extra,
+        )
+        self._log(turn, log_entry)
+        self._record_turn(turn, safety_result.message or "")
+
+        return {
+            "id": turn.id,
+            "session_id": turn.session_id,
+            "intent": safety_result.category,
+            "response": safety_result.message,
+            "sources": [],
+            "latency_ms": latency,
+        }
+
+    def _answer(
+        self,
+        turn: _Turn,
+        intent: str,
+        answer: str,
+        context_snippets: List[Snippet],
+    ) -> Dict[str, Any]:
+        latency = turn.latency_ms()
+        turn.extra["timings_ms"] = turn.timer.rounded()
 
         log_entry = InteractionLog(
-            id=interaction_id,
-            user_msg=msg,
+            id=turn.id,
+            user_msg=turn.msg,
             intent=intent,
             response=answer,
-            model=config.OLLAMA_MODEL if config.USE_OLLAMA else "dummy",
+            model=self._model_name(),
             latency_ms=latency,
             risk_flag=False,
             sensitive_flag=False,
             retrieved_doc_ids=[s.id for s in context_snippets],
             guardrail_triggered=None,
+            extra=turn.extra,
         )
-        self._logger.log(log_entry)
+        self._log(turn, log_entry)
+        self._record_turn(turn, answer)
 
         return {
-            "id": interaction_id,
+            "id": turn.id,
+            "session_id": turn.session_id,
             "intent": intent,
             "response": answer,
-            "sources": [
-                    {"id": s.id, "text": s.text, "score": s.score, "source": s.source}
-                    for s in context_snippets
-                ],
+            "sources": self._sources(context_snippets),
             "latency_ms": latency,
         }
 
+    def _log(self, turn: _Turn, log_entry: InteractionLog) -> None:
+        # the log stage cannot be part of its own record; it only goes to metrics
+        with turn.timer.stage("log"):
+            self._logger.log(log_entry)
+        for stage, ms in turn.timer.timings.items():
+            self._m_stage.observe(ms, stage=stage)
+        self._m_latency.observe((time.perf_counter() - turn.started) * 1000, path=turn.path)
+        self._m_requests.inc(intent=log_entry.intent, guardrail=log_entry.guardrail_triggered or "none")
+
+    @staticmethod
+    def _sources(context_snippets: List[Snippet]) -> List[Dict[str, Any]]:
+        return [
+            {"id": s.id, "text": s.text, "score": s.score, "source": s.source}
+            for s in context_snippets
+        ]
 
-def build_orchestrator() -> ChatOrchestrator:
+    @staticmethod
+    def _model_name() -> str:
+        return config.OLLAMA_MODEL if config.USE_OLLAMA else "dummy"
+
+
+def build_orchestrator(logger: InteractionLogger | None = None) -> ChatOrchestrator:
     """
     Factory that wires together concrete implementations.
     Allows us to keep app.py very thin.
     """
     safety_filter = SafetyFilter()
-    intent_classifier = IntentClassifier()
     snippets = load_policy_snippets()
     embedder = EmbeddingProvider()
-    retriever = Retriever(snippets, embedder)
+    intent_classifier = IntentClassifier(
+        centroids=load_or_build_centroids(embedder) if config.INTENT_MODE == "centroid" else None
+    )
+    store = EmbeddingStore(embedder) if config.USE_EMBED_CACHE else None
+    retriever = Retriever(snippets, embedder, store=store)
+    ingestor = CorpusIngestor(retriever)
+    if config.CORPUS_WATCH_INTERVAL_S > 0:
+        ingestor.start_watching(config.CORPUS_WATCH_INTERVAL_S)
     llm = build_llm_provider()
-    logger = InteractionLogger()
+    logger = logger or InteractionLogger()
+    answer_cache = (
+        SemanticAnswerCache(config.ANSWER_CACHE_THRESHOLD, config.ANSWER_CACHE_SIZE, config.ANSWER_CACHE_TTL_S)
+        if config.ANSWER_CACHE_ENABLED
+        else None
+    )
+    fast_path = FastPathResponder() if config.FAST_PATH_ENABLED else None
+    admission = (
+        AdmissionController(config.ADMISSION_MAX_CONCURRENT, config.ADMISSION_MAX_QUEUE)
+        if config.ADMISSION_MAX_CONCURRENT > 0
+        else None
+    )
     return ChatOrchestrator(
         safety_filter=safety_filter,
         intent_classifier=intent_classifier,
         retriever=retriever,
         llm=llm,
         logger=logger,
+        answer_cache=answer_cache,
+        ingestor=ingestor,
+        admission=admission,
+        fast_path=fast_path,
     )
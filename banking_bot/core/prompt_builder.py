@@ -1,31 +1,104 @@
 # banking_bot/core/prompt_builder.py
+"""
+Token-budgeted prompt assembly.
+
+Sections are ordered from most to least stable: system prompt, conversation
+history, then the retrieved context (which changes every turn) and the new
+user message. Keeping the stable part first lets the LLM backend reuse its
+KV cache for the shared prefix.
+"""
+import re
+from functools import lru_cache
 from typing import List
 from ..models import ChatMessage, Snippet
 from .. import config
 
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+CONTEXT_HEADER = "Relevant banking context (RBI/bank-aligned snippets):"
+NO_CONTEXT = "No specific context found; answer only if you are confident and stay general."
+HISTORY_HEADER = "Conversation so far:"
+
+
+def count_tokens(text: str) -> int:
+    """
+    Cheap estimate of LLM tokens: one per word or punctuation mark, plus one
+    for every further 6 characters of long words (which BPE vocabularies split).
+    """
+    return sum(1 + (len(tok) - 1) // 6 for tok in _TOKEN_RE.findall(text))
+
+
+@lru_cache(maxsize=64)
+def _count_cached(text: str) -> int:
+    # for text that repeats across turns (system prompt, policy snippets)
+    return count_tokens(text)
 
-def build_prompt(user_msg: str, history: List[ChatMessage], context_snippets: List[Snippet]) -> str:
-    # context
-    if context_snippets:
-        ctx_block = "Relevant banking context (RBI/bank-aligned snippets):\n"
-        for snip in context_snippets:
-            ctx_block += f"- {snip.text}\n"
-    else:
-        ctx_block = "No specific context found; answer only if you are confident and stay general.\n"
 
-    # history
-    hist_block = ""
-    for turn in history[-6:]:
-        if turn.role not in ("user", "assistant"):
+def _context_lines(context_snippets: List[Snippet], budget: int) -> List[str]:
+    lines: List[str] = []
+    for snip in context_snippets:  # best match first
+        line = f"- {snip.text}"
+        cost = _count_cached(line)
+        if cost > budget:
             continue
-        hist_block += f"{turn.role.capitalize()}: {turn.content}\n"
+        lines.append(line)
+        budget -= cost
+    if not lines:
+        return [NO_CONTEXT]
+    return [CONTEXT_HEADER, *lines]
+
+
+def _history_lines(user_msg: str, history: List[ChatMessage], budget: int) -> List[str]:
+    turns = [t for t in history if t.role in ("user", "assistant")]
+    # clients may send the current message as the last history entry
+    if turns and turns[-1].role == "user" and turns[-1].content.strip() == user_msg:
+        turns.pop()
+
+    lines: List[str] = []
+    for turn in reversed(turns[-config.PROMPT_HISTORY_TURNS:]):  # newest first
+        line = f"{turn.role.capitalize()}: {turn.content}"
+        cost = count_tokens(line)
+        if cost > budget:
+            break
+        lines.append(line)
+        budget -= cost
+    lines.reverse()
+    return lines
+
+
+def build_prompt(
+    user_msg: str,
+    history: List[ChatMessage],
+    context_snippets: List[Snippet],
+    max_tokens: int | None = None,
+) -> str:
+    """
+    Full prompt for a turn, trimmed to max_tokens (config.PROMPT_MAX_TOKENS).
+    System prompt and user message are always kept; retrieved snippets are
+    added best-first, then as many recent history turns as still fit.
+    """
+    question = f"User: {user_msg}\nAssistant:"
+    budget = max_tokens or config.PROMPT_MAX_TOKENS
+    budget -= _count_cached(config.SYSTEM_PROMPT) + count_tokens(question) + _count_cached(HISTORY_HEADER)
+
+    ctx = _context_lines(context_snippets, budget - _count_cached(CONTEXT_HEADER))
+    budget -= sum(_count_cached(line) for line in ctx)
+    hist = _history_lines(user_msg, history, budget)
 
-    prompt = f"""{config.SYSTEM_PROMPT}
+    parts = [config.SYSTEM_PROMPT, HISTORY_HEADER, *hist, "", *ctx, "", question]
+    return "\n".join(parts)
 
-{ctx_block}
 
-Conversation so far:
-{hist_block}
-User: {user_msg}
-Assistant:"""
-    return prompt
+def build_followup_prompt(
+    user_msg: str,
+    context_snippets: List[Snippet],
+    max_tokens: int | None = None,
+) -> str:
+    """
+    Prompt for a turn that continues from the backend's saved context: the
+    system prompt and history are already there, only the new part is sent.
+    """
+    question = f"User: {user_msg}\nAssistant:"
+    budget = (max_tokens or config.PROMPT_MAX_TOKENS) - count_tokens(question)
+    ctx = _context_lines(context_snippets, budget - _count_cached(CONTEXT_HEADER))
+    return "\n".join([*ctx, "", question])
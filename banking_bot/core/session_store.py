@@ -0,0 +1,157 @@
+# banking_bot/core/session_store.py
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import numpy as np
+
+from ..models import ChatMessage
+
+# rough per-message cost besides the text itself (tuple, str headers, deque slot)
+_MESSAGE_OVERHEAD_BYTES = 120
+_SESSION_OVERHEAD_BYTES = 600
+
+
+class _Session:
+    __slots__ = ("turns", "llm_context", "last_seen", "nbytes")
+
+    def __init__(self, max_messages: int) -> None:
+        self.turns: Deque[Tuple[str, str]] = deque(maxlen=max_messages)  # (role, content)
+        self.llm_context: Optional[np.ndarray] = None
+        self.last_seen = time.monotonic()
+        self.nbytes = _SESSION_OVERHEAD_BYTES
+
+    def recount(self) -> int:
+        self.nbytes = _SESSION_OVERHEAD_BYTES + sum(len(c) + _MESSAGE_OVERHEAD_BYTES for _, c in self.turns)
+        if self.llm_context is not None:
+            self.nbytes += self.llm_context.nbytes
+        return self.nbytes
+
+
+class SessionStore:
+    """
+    Single-responsibility: server-side conversation state, so clients only
+    send the new message.
+
+    Per session it keeps the last `max_messages` turns and the LLM backend
+    context (int32 token array). Sessions idle for longer than `idle_ttl_s`
+    expire; beyond `max_bytes` of estimated memory the least recently used
+    sessions are evicted. Unknown or evicted ids behave like an empty session.
+    """
+
+    def __init__(self, max_bytes: int, idle_ttl_s: float, max_messages: int) -> None:
+        self._max_bytes = max_bytes
+        self._idle_ttl_s = idle_ttl_s
+        self._max_messages = max_messages
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    def history(self, session_id: str) -> List[ChatMessage]:
+        with self._lock:
+            session = self._get(session_id)
+            if session is None:
+                return []
+            return [ChatMessage(role=role, content=content) for role, content in session.turns]
+
+    def context(self, session_id: str) -> Optional[np.ndarray]:
+        with self._lock:
+            session = self._get(session_id)
+            return None if session is None else session.llm_context
+
+    def append(self, session_id: str, user_msg: str, answer: str) -> None:
+        with self._lock:
+            session = self._get_or_create(session_id)
+            session.turns.append(("user", user_msg))
+            session.turns.append(("assistant", answer))
+            self._resize(session)
+
+    def sync(self, session_id: str, history: List[ChatMessage]) -> bool:
+        """
+        Make the stored turns match the client's copy of the conversation.
+        False when they differed (e.g. another worker process answered the
+        previous turns): the turns are replaced and the LLM context, which
+        no longer covers the conversation, is dropped.
+        """
+        tail = [(m.role, m.content) for m in history[-self._max_messages:]] if self._max_messages else []
+        with self._lock:
+            session = self._get_or_create(session_id)
+            if list(session.turns) == tail:
+                return True
+            session.turns.clear()
+            session.turns.extend(tail)
+            session.llm_context = None
+            self._resize(session)
+            return False
+
+    def set_context(self, session_id: str, llm_context: Optional[np.ndarray]) -> None:
+        with self._lock:
+            session = self._get(session_id) if llm_context is None else self._get_or_create(session_id)
+            if session is None:
+                return
+            session.llm_context = llm_context
+            self._resize(session)
+
+    def reset(self, session_id: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._nbytes -= session.nbytes
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._sessions),
+            "bytes": self._nbytes,
+            "max_bytes": self._max_bytes,
+            "evicted": self.evicted,
+        }
+
+    def _get(self, session_id: str) -> Optional[_Session]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        now = time.monotonic()
+        if now - session.last_seen > self._idle_ttl_s:
+            self._evict(session_id)
+            return None
+        session.last_seen = now
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _get_or_create(self, session_id: str) -> _Session:
+        session = self._get(session_id)
+        if session is None:
+            session = _Session(self._max_messages)
+            self._sessions[session_id] = session
+            self._nbytes += session.nbytes
+        return session
+
+    def _resize(self, session: _Session) -> None:
+        before = session.nbytes
+        self._nbytes += session.recount() - before
+        self._shrink()
+
+    def _shrink(self) -> None:
+        # least recently used first; idle sessions are always at that end
+        now = time.monotonic()
+        while self._sessions:
+            session_id, oldest = next(iter(self._sessions.items()))
+            if now - oldest.last_seen <= self._idle_ttl_s and (
+                self._nbytes <= self._max_bytes or len(self._sessions) == 1
+            ):
+                break
+            self._evict(session_id)
+
+    def _evict(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id)
+        self._nbytes -= session.nbytes
+        self.evicted += 1
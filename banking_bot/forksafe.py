@@ -0,0 +1,42 @@
+# banking_bot/forksafe.py
+import os
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class PerProcess(Generic[T]):
+    """
+    Single-responsibility: hold a value that must be created in the process
+    that uses it.
+
+    Threads (and thread pools) do not survive fork(): a pre-fork server's
+    workers would inherit a queue nobody drains. get() calls `factory` on
+    first use in each process, so a forked child starts its own.
+    """
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    self._value = self._factory()
+                    self._pid = pid
+        return self._value
+
+    def current(self) -> Optional[T]:
+        """The value if this process created one, without creating it."""
+        return self._value if self._pid == os.getpid() else None
+
+    def reset(self) -> None:
+        """Drop the value; the next get() creates a new one."""
+        with self._lock:
+            self._value = None
+            self._pid = None
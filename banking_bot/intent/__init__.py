@@ -1,4 +1,5 @@
 # banking_bot/intent/__init__.py
 from .classifier import IntentClassifier
+from .centroids import IntentCentroids, load_or_build_centroids
 
-__all__ = ["IntentClassifier"]
+__all__ = ["IntentClassifier", "IntentCentroids", "load_or_build_centroids"]
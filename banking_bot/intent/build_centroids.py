@@ -0,0 +1,60 @@
+# banking_bot/intent/build_centroids.py
+"""
+Rebuild the intent centroids from labelled examples and report how well
+nearest-centroid classification separates them.
+
+    python -m banking_bot.intent.build_centroids
+    python -m banking_bot.intent.build_centroids --examples data/intent_examples.jsonl --out .embed_cache/intent_centroids.npz
+
+Accuracy is leave-one-out: every example is scored against centroids built
+without it. The score percentiles help pick INTENT_CENTROID_THRESHOLD.
+"""
+import argparse
+from collections import Counter
+
+import numpy as np
+
+from .. import config
+from ..rag import EmbeddingProvider
+from .centroids import IntentCentroids, load_examples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--examples", default=config.INTENT_EXAMPLES_FILE)
+    parser.add_argument("--out", default=config.INTENT_CENTROIDS_FILE)
+    args = parser.parse_args()
+
+    embedder = EmbeddingProvider()
+    examples = load_examples(args.examples)
+    centroids = IntentCentroids.from_examples(examples, embedder.encode)
+    centroids.save(args.out, embedder.model_name)
+    print(f"{len(centroids.labels)} intents from {len(examples)} examples -> {args.out}")
+
+    # leave-one-out: remove each example from its own intent's sum
+    vecs = embedder.encode([text for text, _ in examples])
+    rows = np.array([centroids.labels.index(intent) for _, intent in examples])
+    sums = np.zeros_like(centroids.centroids)
+    np.add.at(sums, rows, vecs)
+    correct: Counter = Counter()
+    totals: Counter = Counter()
+    best_scores = []
+    for i, (_, intent) in enumerate(examples):
+        loo = sums.copy()
+        loo[rows[i]] -= vecs[i]
+        loo /= np.linalg.norm(loo, axis=1, keepdims=True) + 1e-9
+        sims = loo @ vecs[i]
+        totals[intent] += 1
+        correct[intent] += int(np.argmax(sims) == rows[i])
+        best_scores.append(float(sims.max()))
+
+    print(f"leave-one-out accuracy: {sum(correct.values()) / len(examples):.2%}")
+    for intent in centroids.labels:
+        print(f"  {intent:<16}{correct[intent]:>4}/{totals[intent]:<4}")
+    pct = np.percentile(best_scores, [5, 25, 50])
+    print(f"best-centroid score p5={pct[0]:.3f} p25={pct[1]:.3f} p50={pct[2]:.3f} "
+          f"(threshold {config.INTENT_CENTROID_THRESHOLD})")
+
+
+if __name__ == "__main__":
+    main()
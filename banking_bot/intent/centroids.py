@@ -0,0 +1,119 @@
+# banking_bot/intent/centroids.py
+import hashlib
+import json
+import os
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+from .. import config
+
+
+def load_examples(path: str | None = None) -> List[Tuple[str, str]]:
+    """
+    Labelled examples as (text, intent) pairs from a JSONL file with
+    {"intent": ..., "text": ...} per line.
+    """
+    examples: List[Tuple[str, str]] = []
+    with open(path or config.INTENT_EXAMPLES_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                examples.append((row["text"], row["intent"]))
+    return examples
+
+
+def examples_fingerprint(examples: List[Tuple[str, str]]) -> str:
+    return hashlib.sha256(
+        "".join(f"{intent}\t{text}\n" for text, intent in examples).encode("utf-8")
+    ).hexdigest()
+
+
+class IntentCentroids:
+    """
+    Single-responsibility: score a query embedding against one normalized
+    centroid per intent (nearest-centroid classification).
+
+    Scoring is a single (n_intents x dim) @ (dim,) product on the vector the
+    retriever already computed, so it adds no model call.
+    """
+
+    def __init__(self, labels: List[str], centroids: np.ndarray, fingerprint: str = "") -> None:
+        self.labels = list(labels)
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.fingerprint = fingerprint
+        self._row = {label: i for i, label in enumerate(self.labels)}
+
+    @classmethod
+    def from_examples(
+        cls, examples: List[Tuple[str, str]], encode: Callable[[List[str]], np.ndarray]
+    ) -> "IntentCentroids":
+        labels = sorted({intent for _, intent in examples})
+        vecs = encode([text for text, _ in examples])
+        rows = np.array([labels.index(intent) for _, intent in examples])
+        sums = np.zeros((len(labels), vecs.shape[1]), dtype=np.float32)
+        np.add.at(sums, rows, vecs)
+        centroids = sums / (np.linalg.norm(sums, axis=1, keepdims=True) + 1e-9)
+        return cls(labels, centroids, examples_fingerprint(examples))
+
+    def save(self, path: str, model_name: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp.npz"
+        np.savez(
+            tmp,
+            labels=np.array(self.labels),
+            centroids=self.centroids,
+            model=np.array(model_name),
+            fingerprint=np.array(self.fingerprint),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, model_name: str) -> Optional["IntentCentroids"]:
+        """Centroids saved for `model_name`, or None when missing or built for another model."""
+        try:
+            with np.load(path) as data:
+                if str(data["model"]) != model_name:
+                    return None
+                return cls([str(x) for x in data["labels"]], data["centroids"], str(data["fingerprint"]))
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def scores(self, q_vec: np.ndarray) -> np.ndarray:
+        return self.centroids @ q_vec
+
+    def nearest(self, q_vec: np.ndarray) -> Tuple[str, float]:
+        sims = self.scores(q_vec)
+        best = int(np.argmax(sims))
+        return self.labels[best], float(sims[best])
+
+    def score_of(self, label: str, q_vec: np.ndarray) -> float:
+        row = self._row.get(label)
+        return 0.0 if row is None else float(self.centroids[row] @ q_vec)
+
+
+def load_or_build_centroids(
+    embedder,
+    path: str | None = None,
+    examples_path: str | None = None,
+) -> Optional[IntentCentroids]:
+    """
+    Centroids for the embedder's model: loaded from `path`, or rebuilt from
+    the labelled examples (and saved) when the file is missing, was built for
+    another model or is older than the examples.
+    """
+    path = path or config.INTENT_CENTROIDS_FILE
+    try:
+        examples = load_examples(examples_path)
+    except OSError as e:
+        print("Intent examples unavailable, using keyword intents:", e)
+        return None
+
+    centroids = IntentCentroids.load(path, embedder.model_name)
+    if centroids is not None and centroids.fingerprint == examples_fingerprint(examples):
+        return centroids
+
+    centroids = IntentCentroids.from_examples(examples, embedder.encode)
+    try:
+        centroids.save(path, embedder.model_name)
+    except OSError as e:
+        print("Intent centroids not saved:", e)
+    return centroids
@@ -1,28 +1,86 @@
 # banking_bot/intent/classifier.py
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from .. import config
+from ..matcher import KeywordMatcher, get_keyword_matcher, intent_label
+from .centroids import IntentCentroids
+
+FOLLOWUP_PHRASES = (
+    "i have a question", "i have another question", "i have a question to ask",
+    "i have another question to ask", "i want to ask something",
+)
 
 
 class IntentClassifier:
     """
     Single-responsibility: map user text → high-level intent label.
+
+    With intent centroids, the query embedding is classified by its nearest
+    centroid; keyword rules decide when that match is not confident enough.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        matcher: KeywordMatcher | None = None,
+        centroids: IntentCentroids | None = None,
+        threshold: float | None = None,
+    ) -> None:
         self._intent_keywords = config.INTENT_KEYWORDS
+        self._matcher = matcher or get_keyword_matcher()
+        self._centroids = centroids
+        self._threshold = config.INTENT_CENTROID_THRESHOLD if threshold is None else threshold
+
+    def classify(self, text: str, keyword_hits: Optional[Dict[str, List[str]]] = None) -> str:
+        return self.classify_with_matches(text, keyword_hits)[0]
 
-    def classify(self, text: str) -> str:
+    def classify_with_matches(
+        self, text: str, keyword_hits: Optional[Dict[str, List[str]]] = None
+    ) -> Tuple[str, List[str]]:
+        """
+        Return (intent, matched keywords). `keyword_hits` may be passed in from
+        an earlier scan of the same text (e.g. SafetyResult.keyword_hits).
+        """
         t = text.lower().strip()
 
         # follow-up / filler intents
-        if t in ("i have a question", "i have another question", "i have a question to ask",
-                "i have another question to ask", "i want to ask something"):
-            return "followup"
+        if t in FOLLOWUP_PHRASES:
+            return "followup", []
 
-        for intent, keywords in self._intent_keywords.items():
-            if any(kw in t for kw in keywords):
-                return intent
+        hits = keyword_hits if keyword_hits is not None else self._matcher.find(t)
+        for intent in self._intent_keywords:
+            matched = hits.get(intent_label(intent))
+            if matched:
+                return intent, matched
 
         if t in ("hi", "hello", "hey", "namaste"):
-            return "greetings"
+            return "greetings", []
+
+        return "general", []
+
+    def classify_with_score(
+        self,
+        text: str,
+        q_vec: np.ndarray | None = None,
+        keyword_hits: Optional[Dict[str, List[str]]] = None,
+    ) -> Tuple[str, float, List[str]]:
+        """
+        Return (intent, confidence, matched keywords). `q_vec` is the query
+        embedding computed for retrieval. The nearest intent centroid wins when
+        its cosine similarity reaches the threshold, otherwise the keyword
+        rules decide. Confidence is the similarity to the chosen intent's
+        centroid (0.0 without centroids or for intents that have none).
+        """
+        if text.lower().strip() in FOLLOWUP_PHRASES:
+            return "followup", 1.0, []
+
+        hits = keyword_hits if keyword_hits is not None else self._matcher.find(text.lower().strip())
+        if self._centroids is not None and q_vec is not None:
+            intent, score = self._centroids.nearest(q_vec)
+            if score >= self._threshold:
+                return intent, score, hits.get(intent_label(intent), [])
 
-        return "general"
+        intent, matched = self.classify_with_matches(text, hits)
+        score = 0.0
+        if self._centroids is not None and q_vec is not None:
+            score = self._centroids.score_of(intent, q_vec)
+        return intent, score, matched
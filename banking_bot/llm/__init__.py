@@ -1,4 +1,5 @@
 # banking_bot/llm/__init__.py
 from .provider import LLMProvider, DummyProvider, OllamaProvider, build_llm_provider
+from .router import RoutingProvider
 
-__all__ = ["LLMProvider", "DummyProvider", "OllamaProvider", "build_llm_provider"]
+__all__ = ["LLMProvider", "DummyProvider", "OllamaProvider", "RoutingProvider", "build_llm_provider"]
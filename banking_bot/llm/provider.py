@@ -1,8 +1,14 @@
 # banking_bot/llm/provider.py
 from __future__ import annotations
 from abc import ABC, abstractmethod
+import asyncio
+import json
+from typing import Any, Dict, Iterator, List, Optional
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 from .. import config
+from ..models import LLMResult
 
 
 class LLMProvider(ABC):
@@ -14,6 +20,52 @@ class LLMProvider(ABC):
     def generate(self, prompt: str) -> str:
         ...
 
+    def complete(self, prompt: str, context: Optional[List[int]] = None) -> LLMResult:
+        """
+        Like generate, but continues from `context` (the state returned by the
+        previous call of a session) when the backend supports it, and returns
+        the new state. Backends without such state ignore it and return None.
+        On errors the result has failed=True and an error message as text.
+        """
+        return LLMResult(text=self.generate(prompt))
+
+    def stream(
+        self, prompt: str, context: Optional[List[int]] = None, result: Optional[LLMResult] = None
+    ) -> Iterator[str]:
+        """
+        Yield the answer as text chunks while it is generated; `result` is
+        filled in when the stream ends; failed=True there means the stream
+        broke off and the text is not a complete answer. Backends without
+        native streaming return the whole answer as one chunk.
+        """
+        completed = self.complete(prompt, context)
+        if result is not None:
+            result.text, result.context, result.backend = completed.text, completed.context, completed.backend
+            result.failed = completed.failed
+        yield completed.text
+
+    async def agenerate(self, prompt: str) -> str:
+        """
+        Async variant of generate. Blocking backends run in a worker thread.
+        """
+        return await asyncio.to_thread(self.generate, prompt)
+
+    async def acomplete(self, prompt: str, context: Optional[List[int]] = None) -> LLMResult:
+        """
+        Async variant of complete.
+        """
+        return LLMResult(text=await self.agenerate(prompt))
+
+    def after_fork(self) -> None:
+        """
+        Drop connections inherited from a parent process (gunicorn pre-fork).
+        """
+
+    async def aclose(self) -> None:
+        """
+        Release async resources on server shutdown.
+        """
+
 
 class DummyProvider(LLMProvider):
     """
@@ -26,38 +78,178 @@ class DummyProvider(LLMProvider):
             "Enable USE_OLLAMA to get full LLM-generated answers grounded in RBI-aligned policies."
         )
 
+    async def agenerate(self, prompt: str) -> str:
+        return self.generate(prompt)
+
 
 class OllamaProvider(LLMProvider):
     """
     LLM provider using a local Ollama server.
+
+    Sync calls share one pooled keep-alive requests.Session; async calls share
+    one httpx.AsyncClient per event loop, so many requests can be in flight
+    without a thread each.
     """
 
-    def __init__(self, url: str, model: str) -> None:
+    def __init__(
+        self,
+        url: str,
+        model: str,
+        pool_size: int | None = None,
+        connect_timeout_s: float | None = None,
+        read_timeout_s: float | None = None,
+    ) -> None:
         self._url = url
         self._model = model
+        self._timeout = (
+            connect_timeout_s or config.OLLAMA_CONNECT_TIMEOUT_S,
+            read_timeout_s or config.OLLAMA_READ_TIMEOUT_S,
+        )
+
+        self._pool_size = pool_size or config.OLLAMA_POOL_SIZE
+        self._session = self._new_session()
+
+        self._async_client: httpx.AsyncClient | None = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _payload(self, prompt: str, stream: bool, context: Optional[List[int]] = None) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "model": self._model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": 0.3,
+                "top_p": 0.9,
+                "num_predict": config.OLLAMA_NUM_PREDICT,
+                "num_ctx": config.OLLAMA_NUM_CTX,
+            },
+        }
+        if context:
+            # token state returned by the previous call: Ollama continues from
+            # it and only has to prefill the new prompt
+            payload["context"] = context
+        return payload
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    def _result(self, data: Dict[str, Any]) -> LLMResult:
+        return LLMResult(text=data.get("response", "").strip(), context=data.get("context"), backend=self._url)
 
     def generate(self, prompt: str) -> str:
+        return self.complete(prompt).text
+
+    def request(self, prompt: str, context: Optional[List[int]] = None) -> LLMResult:
+        """
+        complete() without error handling: raises on connection, timeout and
+        HTTP errors (used by RoutingProvider to fail over).
+        """
+        r = self._session.post(self._url, json=self._payload(prompt, False, context), timeout=self._timeout)
+        r.raise_for_status()
+        return self._result(r.json())
+
+    def complete(self, prompt: str, context: Optional[List[int]] = None) -> LLMResult:
         try:
-            r = requests.post(
-                self._url,
-                json={
-                    "model": self._model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.3,
-                        "top_p": 0.9,
-                        "num_predict": 256,
-                    },
-                },
-                timeout=60,
-            )
-            r.raise_for_status()
-            data = r.json()
-            return data.get("response", "").strip()
+            return self.request(prompt, context)
         except Exception as e:
             print("LLM (Ollama) error:", e)
-            return "I’m experiencing technical difficulties accessing the model. Please try again later."
+            return LLMResult(text=config.LLM_ERROR_MSG, backend=self._url, failed=True)
+
+    def stream_events(self, prompt: str, context: Optional[List[int]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Raw NDJSON objects of a streamed generation, until "done": true (the
+        final object carries the context). Raises on errors.
+        """
+        with self._session.post(
+            self._url, json=self._payload(prompt, True, context), stream=True, timeout=self._timeout
+        ) as r:
+            r.raise_for_status()
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                yield data
+                if data.get("done"):
+                    break
+
+    def stream(
+        self, prompt: str, context: Optional[List[int]] = None, result: Optional[LLMResult] = None
+    ) -> Iterator[str]:
+        chunks: List[str] = []
+        new_context = None
+        failed = False
+        try:
+            for data in self.stream_events(prompt, context):
+                chunk = data.get("response", "")
+                if not chunks:
+                    chunk = chunk.lstrip()
+                if chunk:
+                    chunks.append(chunk)
+                    yield chunk
+                if data.get("done"):
+                    new_context = data.get("context")
+        except Exception as e:
+            print("LLM (Ollama) stream error:", e)
+            failed = True
+            chunks.append(config.LLM_ERROR_MSG)
+            yield config.LLM_ERROR_MSG
+        if result is not None:
+            result.text, result.context, result.backend = "".join(chunks).strip(), new_context, self._url
+            result.failed = failed
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        # an AsyncClient is bound to the loop it was first used on
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            connect_s, read_s = self._timeout
+            self._async_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(read_s, connect=connect_s),
+                limits=httpx.Limits(
+                    max_connections=config.OLLAMA_ASYNC_MAX_CONNECTIONS,
+                    max_keepalive_connections=config.OLLAMA_POOL_SIZE,
+                ),
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    async def agenerate(self, prompt: str) -> str:
+        return (await self.acomplete(prompt)).text
+
+    async def arequest(self, prompt: str, context: Optional[List[int]] = None) -> LLMResult:
+        """Async request(): raises on errors."""
+        r = await self._get_async_client().post(self._url, json=self._payload(prompt, False, context))
+        r.raise_for_status()
+        return self._result(r.json())
+
+    async def acomplete(self, prompt: str, context: Optional[List[int]] = None) -> LLMResult:
+        try:
+            return await self.arequest(prompt, context)
+        except Exception as e:
+            print("LLM (Ollama) async error:", e)
+            return LLMResult(text=config.LLM_ERROR_MSG, backend=self._url, failed=True)
+
+    def after_fork(self) -> None:
+        # sockets in the parent's pool must not be shared with the child
+        self._session = self._new_session()
+        self._async_client = None
+        self._async_loop = None
+
+    def close(self) -> None:
+        self._session.close()
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_loop = None
 
 
 def build_llm_provider() -> LLMProvider:
@@ -65,5 +257,10 @@ def build_llm_provider() -> LLMProvider:
     Factory: chooses LLM backend based on config.
     """
     if config.USE_OLLAMA:
-        return OllamaProvider(url=config.OLLAMA_URL, model=config.OLLAMA_MODEL)
+        urls = config.OLLAMA_URLS or [config.OLLAMA_URL]
+        if len(urls) > 1:
+            from .router import RoutingProvider
+
+            return RoutingProvider([OllamaProvider(url=u, model=config.OLLAMA_MODEL) for u in urls])
+        return OllamaProvider(url=urls[0], model=config.OLLAMA_MODEL)
     return DummyProvider()
@@ -0,0 +1,347 @@
+# banking_bot/llm/router.py
+from __future__ import annotations
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Deque, Dict, Iterator, List, Optional
+from .. import config
+from ..forksafe import PerProcess
+from ..metrics import MetricsRegistry, REGISTRY
+from ..models import LLMResult
+from .provider import LLMProvider, OllamaProvider
+
+
+class CircuitBreaker:
+    """
+    Per-backend circuit breaker.
+
+    closed → open after `failure_threshold` consecutive failures; open rejects
+    calls for `cooldown_s`; then half-open lets a single probe through, whose
+    outcome closes the circuit again or re-opens it for another cooldown.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int, cooldown_s: float) -> None:
+        self._failure_threshold = max(1, failure_threshold)
+        self._cooldown_s = cooldown_s
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._cooldown_s:
+            return self.HALF_OPEN
+        return self._state
+
+    def available(self) -> bool:
+        state = self.state
+        return state == self.CLOSED or (state == self.HALF_OPEN and not self._probing)
+
+    def acquire(self) -> bool:
+        """Claim a call; in half-open state only one probe at a time."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probing:
+            self._state = self.HALF_OPEN
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+    def release(self) -> None:
+        """A claimed call ended without a verdict (e.g. cancelled hedge)."""
+        self._probing = False
+
+
+class _Backend:
+    def __init__(self, provider: OllamaProvider, breaker: CircuitBreaker) -> None:
+        self.provider = provider
+        self.breaker = breaker
+        self.outstanding = 0
+        self.ewma_ms = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.provider.url
+
+
+class RoutingProvider(LLMProvider):
+    """
+    LLMProvider over several Ollama endpoints serving the same model.
+
+    - each call goes to the available backend with the fewest outstanding
+      requests (ties: lower recent latency)
+    - if no answer arrived after the hedge delay (p95 of recent latencies),
+      a duplicate goes to another backend and the first answer wins
+    - failed calls fail over to the next backend right away; backends that
+      keep failing are skipped by their circuit breaker until a probe succeeds
+
+    LLMResult.backend records the URL that served the answer. Streams fail
+    over only before the first token and are not hedged.
+    """
+
+    def __init__(
+        self,
+        backends: List[OllamaProvider],
+        hedge: bool | None = None,
+        failure_threshold: int | None = None,
+        cooldown_s: float | None = None,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        if not backends:
+            raise ValueError("RoutingProvider needs at least one backend")
+        self._backends = [
+            _Backend(
+                p,
+                CircuitBreaker(
+                    failure_threshold or config.LLM_BREAKER_FAILURES,
+                    config.LLM_BREAKER_COOLDOWN_S if cooldown_s is None else cooldown_s,
+                ),
+            )
+            for p in backends
+        ]
+        self._hedge = config.LLM_HEDGE_ENABLED if hedge is None else hedge
+        self._latencies: Deque[float] = deque(maxlen=config.LLM_HEDGE_WINDOW)
+        self._lock = threading.Lock()
+        self._pool: PerProcess[ThreadPoolExecutor] = PerProcess(self._new_pool)
+        self._init_metrics(metrics or REGISTRY)
+
+    def _init_metrics(self, registry: MetricsRegistry) -> None:
+        self._m_calls = registry.counter(
+            "llm_backend_requests_total", "LLM backend calls by outcome.", ["backend", "outcome"]
+        )
+        self._m_hedged = registry.counter("llm_hedged_requests_total", "Hedged duplicate LLM requests sent.")
+        state_value = {CircuitBreaker.CLOSED: 0.0, CircuitBreaker.HALF_OPEN: 0.5, CircuitBreaker.OPEN: 1.0}
+        registry.gauge_callback(
+            "llm_backend_circuit_state",
+            "Circuit breaker state per LLM backend (0 closed, 0.5 half-open, 1 open).",
+            ["backend"],
+            lambda: {(b.name,): state_value[b.breaker.state] for b in self._backends},
+        )
+        registry.gauge_callback(
+            "llm_backend_outstanding",
+            "In-flight requests per LLM backend.",
+            ["backend"],
+            lambda: {(b.name,): b.outstanding for b in self._backends},
+        )
+
+    # --- backend selection ---------------------------------------------------
+
+    def hedge_delay_s(self) -> float:
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < config.LLM_HEDGE_MIN_SAMPLES:
+            delay_ms = config.LLM_HEDGE_DEFAULT_DELAY_MS
+        else:
+            delay_ms = samples[int(0.95 * (len(samples) - 1))]
+        return max(delay_ms, config.LLM_HEDGE_MIN_DELAY_MS) / 1000
+
+    def _acquire(self, exclude: List[_Backend]) -> Optional[_Backend]:
+        with self._lock:
+            candidates = [b for b in self._backends if b not in exclude and b.breaker.available()]
+            candidates.sort(key=lambda b: (b.outstanding, b.ewma_ms))
+            for backend in candidates:
+                if backend.breaker.acquire():
+                    backend.outstanding += 1
+                    return backend
+        return None
+
+    def _finish(self, backend: _Backend, started: float, ok: Optional[bool]) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            backend.outstanding -= 1
+            if ok is None:
+                backend.breaker.release()
+            elif ok:
+                backend.breaker.record_success()
+                backend.ewma_ms = elapsed_ms if not backend.ewma_ms else 0.8 * backend.ewma_ms + 0.2 * elapsed_ms
+                self._latencies.append(elapsed_ms)
+            else:
+                backend.breaker.record_failure()
+        outcome = "cancelled" if ok is None else ("ok" if ok else "error")
+        self._m_calls.inc(backend=backend.name, outcome=outcome)
+
+    @staticmethod
+    def _unavailable() -> LLMResult:
+        print("LLM router error: no backend available")
+        return LLMResult(text=config.LLM_ERROR_MSG, failed=True)
+
+    # --- sync ------------------------------------------------------------------
+
+    def _new_pool(self) -> ThreadPoolExecutor:
+        workers = config.OLLAMA_POOL_SIZE * len(self._backends)
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-router")
+
+    def _run(self, backend: _Backend, prompt: str, context: Optional[List[int]]) -> LLMResult:
+        started = time.perf_counter()
+        try:
+            result = backend.provider.request(prompt, context)
+        except Exception as e:
+            print("LLM backend error:", backend.name, e)
+            self._finish(backend, started, ok=False)
+            raise
+        self._finish(backend, started, ok=True)
+        return result
+
+    def generate(self, prompt: str) -> str:
+        return self.complete(prompt).text
+
+    def complete(self, prompt: str, context: Optional[List[int]] = None) -> LLMResult:
+        pool = self._pool.get()
+        tried: List[_Backend] = []
+        pending: Dict[Future, _Backend] = {}
+        hedges = config.LLM_HEDGE_MAX if self._hedge else 0
+
+        def launch(hedged: bool = False) -> None:
+            backend = self._acquire(tried)
+            if backend is not None:
+                tried.append(backend)
+                if hedged:
+                    self._m_hedged.inc()
+                pending[pool.submit(self._run, backend, prompt, context)] = backend
+
+        launch()
+        while pending:
+            timeout = self.hedge_delay_s() if hedges > 0 else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedges -= 1
+                launch(hedged=True)
+                continue
+            for future in done:
+                pending.pop(future)
+                if future.exception() is None:
+                    # a slower duplicate still running finishes in the pool
+                    return future.result()
+                launch()  # fail over
+        return self._unavailable()
+
+    def stream(
+        self, prompt: str, context: Optional[List[int]] = None, result: Optional[LLMResult] = None
+    ) -> Iterator[str]:
+        tried: List[_Backend] = []
+        while True:
+            backend = self._acquire(tried)
+            if backend is None:
+                unavailable = self._unavailable()
+                if result is not None:
+                    result.text, result.failed = unavailable.text, True
+                yield unavailable.text
+                return
+            tried.append(backend)
+
+            started = time.perf_counter()
+            chunks: List[str] = []
+            new_context = None
+            failed = False
+            try:
+                for data in backend.provider.stream_events(prompt, context):
+                    chunk = data.get("response", "")
+                    if not chunks:
+                        chunk = chunk.lstrip()
+                    if chunk:
+                        chunks.append(chunk)
+                        yield chunk
+                    if data.get("done"):
+                        new_context = data.get("context")
+            except GeneratorExit:
+                self._finish(backend, started, ok=None)
+                raise
+            except Exception as e:
+                print("LLM backend stream error:", backend.name, e)
+                self._finish(backend, started, ok=False)
+                if not chunks:
+                    continue  # nothing sent to the client yet: try the next backend
+                failed = True
+                chunks.append(config.LLM_ERROR_MSG)
+                yield config.LLM_ERROR_MSG
+            else:
+                self._finish(backend, started, ok=True)
+            if result is not None:
+                result.text, result.context, result.backend = "".join(chunks).strip(), new_context, backend.name
+                result.failed = failed
+            return
+
+    # --- async -----------------------------------------------------------------
+
+    async def _arun(self, backend: _Backend, prompt: str, context: Optional[List[int]]) -> LLMResult:
+        started = time.perf_counter()
+        try:
+            result = await backend.provider.arequest(prompt, context)
+        except asyncio.CancelledError:
+            self._finish(backend, started, ok=None)
+            raise
+        except Exception as e:
+            print("LLM backend async error:", backend.name, e)
+            self._finish(backend, started, ok=False)
+            raise
+        self._finish(backend, started, ok=True)
+        return result
+
+    async def agenerate(self, prompt: str) -> str:
+        return (await self.acomplete(prompt)).text
+
+    async def acomplete(self, prompt: str, context: Optional[List[int]] = None) -> LLMResult:
+        tried: List[_Backend] = []
+        pending: Dict[asyncio.Task, _Backend] = {}
+        hedges = config.LLM_HEDGE_MAX if self._hedge else 0
+
+        def launch(hedged: bool = False) -> None:
+            backend = self._acquire(tried)
+            if backend is not None:
+                tried.append(backend)
+                if hedged:
+                    self._m_hedged.inc()
+                pending[asyncio.ensure_future(self._arun(backend, prompt, context))] = backend
+
+        launch()
+        try:
+            while pending:
+                timeout = self.hedge_delay_s() if hedges > 0 else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedges -= 1
+                    launch(hedged=True)
+                    continue
+                for task in done:
+                    pending.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    launch()  # fail over
+        finally:
+            # unlike threads, the losing duplicate can be cancelled
+            for task in pending:
+                task.cancel()
+        return self._unavailable()
+
+    # --- lifecycle -------------------------------------------------------------
+
+    def after_fork(self) -> None:
+        for backend in self._backends:
+            backend.provider.after_fork()
+        self._pool.reset()
+
+    def close(self) -> None:
+        for backend in self._backends:
+            backend.provider.close()
+
+    async def aclose(self) -> None:
+        for backend in self._backends:
+            await backend.provider.aclose()
@@ -1,4 +1,5 @@
 # banking_bot/logging/__init__.py
 from .logger import InteractionLogger
+from .columnar import compact_logs
 
-__all__ = ["InteractionLogger"]
+__all__ = ["InteractionLogger", "compact_logs"]
@@ -0,0 +1,182 @@
+# banking_bot/logging/analytics.py
+"""
+Compact chat logs into columnar segments and aggregate over them.
+
+    python -m banking_bot.logging.analytics compact
+    python -m banking_bot.logging.analytics stats --since 24h
+    python -m banking_bot.logging.analytics stats --since 2025-11-01 --until 2025-12-01 --json
+
+`compact` appends whatever was logged since its last run (including rotated
+files); `stats --refresh` compacts first. Times are ISO dates/datetimes (UTC
+unless an offset is given) or relative to now: 30m, 24h, 7d.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .. import config
+from .columnar import STRING_COLUMNS, compact_logs, list_segments
+
+_RELATIVE = re.compile(r"^(\d+(?:\.\d+)?)([smhd])$")
+_UNIT_S = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+PERCENTILES = (50, 90, 95, 99)
+
+
+def parse_time(value: Optional[str]) -> Optional[int]:
+    """Epoch ms for an ISO timestamp or a duration before now ("24h")."""
+    if not value:
+        return None
+    m = _RELATIVE.match(value.strip())
+    if m:
+        return int((time.time() - float(m.group(1)) * _UNIT_S[m.group(2)]) * 1000)
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    if values.size == 0:
+        return {}
+    return {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def aggregate(
+    segment_dir: str | None = None,
+    start_ms: Optional[int] = None,
+    end_ms: Optional[int] = None,
+    top: int = 10,
+) -> Dict[str, Any]:
+    """
+    Vectorized aggregation over every segment overlapping [start_ms, end_ms).
+    """
+    total = risky = sensitive = hits = lookups = fast = eligible = 0
+    latencies: List[np.ndarray] = []
+    stages: Dict[str, List[np.ndarray]] = {}
+    counts: Dict[str, Counter] = {col: Counter() for col in STRING_COLUMNS}
+    first_ts: Optional[int] = None
+    last_ts: Optional[int] = None
+
+    for seg in list_segments(segment_dir):
+        if not seg.overlaps(start_ms, end_ms):
+            continue
+        mask = seg.time_mask(start_ms, end_ms)
+
+        def col(name: str) -> np.ndarray:
+            values = seg.column(name)
+            return values if mask is None else values[mask]
+
+        ts = col("ts")
+        if ts.size == 0:
+            continue
+        total += ts.size
+        first_ts = int(ts.min()) if first_ts is None else min(first_ts, int(ts.min()))
+        last_ts = int(ts.max()) if last_ts is None else max(last_ts, int(ts.max()))
+
+        latencies.append(np.asarray(col("latency_ms")))
+        risky += int(np.count_nonzero(col("risk_flag")))
+        sensitive += int(np.count_nonzero(col("sensitive_flag")))
+        cache_hit = col("cache_hit")
+        hits += int(np.count_nonzero(cache_hit == 1))
+        lookups += int(np.count_nonzero(cache_hit >= 0))
+        if seg.has("fast_path"):  # segments compacted before the fast path existed lack it
+            fast_path = col("fast_path")
+            fast += int(np.count_nonzero(fast_path == 1))
+            eligible += int(np.count_nonzero(fast_path >= 0))
+
+        for name in STRING_COLUMNS:
+            # dictionary codes are per segment: count codes, then map to strings
+            dictionary = seg.dictionary(name)
+            per_code = np.bincount(col(name), minlength=len(dictionary))
+            for code in np.flatnonzero(per_code):
+                counts[name][dictionary[code]] += int(per_code[code])
+
+        for name in seg.meta["columns"]:
+            if name.startswith("stage_"):
+                values = col(name)
+                stages.setdefault(name[len("stage_"):], []).append(np.asarray(values[~np.isnan(values)]))
+
+    latency = np.concatenate(latencies) if latencies else np.empty(0, dtype=np.int32)
+    guardrails = {k: v for k, v in counts["guardrail"].items() if k}
+    return {
+        "records": total,
+        "first": datetime.fromtimestamp(first_ts / 1000, timezone.utc).isoformat() if first_ts else None,
+        "last": datetime.fromtimestamp(last_ts / 1000, timezone.utc).isoformat() if last_ts else None,
+        "latency_ms": {"mean": round(float(latency.mean()), 2), **_percentiles(latency)} if total else {},
+        "guardrail_rate": round(sum(guardrails.values()) / total, 4) if total else 0.0,
+        "guardrails": dict(sorted(guardrails.items(), key=lambda kv: -kv[1])),
+        "risk_flag_rate": round(risky / total, 4) if total else 0.0,
+        "sensitive_flag_rate": round(sensitive / total, 4) if total else 0.0,
+        "answer_cache_hit_rate": round(hits / lookups, 4) if lookups else None,
+        "fast_path_answers": fast,
+        "fast_path_rate": round(fast / eligible, 4) if eligible else None,
+        "top_intents": dict(counts["intent"].most_common(top)),
+        "models": dict(counts["model"].most_common()),
+        "stage_latency_ms": {
+            stage: _percentiles(np.concatenate(parts)) for stage, parts in sorted(stages.items())
+        },
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"records: {report['records']}  ({report['first']} .. {report['last']})")
+    if not report["records"]:
+        return
+    print("latency_ms:", "  ".join(f"{k}={v}" for k, v in report["latency_ms"].items()))
+    print(f"guardrail rate: {report['guardrail_rate']:.2%}  {report['guardrails']}")
+    if report["answer_cache_hit_rate"] is not None:
+        print(f"answer cache hit rate: {report['answer_cache_hit_rate']:.2%}")
+    if report["fast_path_rate"] is not None:
+        print(f"fast path: {report['fast_path_answers']} LLM calls saved "
+              f"({report['fast_path_rate']:.2%} of eligible requests)")
+    print("top intents:")
+    for intent, n in report["top_intents"].items():
+        print(f"  {intent:<20}{n:>10}  {n / report['records']:.2%}")
+    print("stage latency_ms:")
+    for stage, pct in report["stage_latency_ms"].items():
+        print(f"  {stage:<20}" + "  ".join(f"{k}={v}" for k, v in pct.items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log-file", default=config.LOG_FILE)
+    parser.add_argument("--segments", default=config.LOG_SEGMENT_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_compact = sub.add_parser("compact", help="append new log records as columnar segments")
+    p_compact.add_argument("--max-rows", type=int, default=config.LOG_SEGMENT_MAX_ROWS)
+
+    p_stats = sub.add_parser("stats", help="latency percentiles, guardrail rates, top intents")
+    p_stats.add_argument("--since", help="ISO time or duration before now (e.g. 24h)")
+    p_stats.add_argument("--until", help="ISO time or duration before now")
+    p_stats.add_argument("--top", type=int, default=10)
+    p_stats.add_argument("--refresh", action="store_true", help="compact new records first")
+    p_stats.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "compact" or args.refresh:
+        started = time.perf_counter()
+        result = compact_logs(args.log_file, args.segments, getattr(args, "max_rows", None))
+        print(
+            f"compacted {result['rows']} records into {len(result['segments'])} segment(s) "
+            f"in {time.perf_counter() - started:.2f}s"
+            + (f", skipped {result['skipped_lines']} bad line(s)" if result["skipped_lines"] else ""),
+            file=sys.stderr if getattr(args, "json", False) else sys.stdout,
+        )
+    if args.command == "stats":
+        report = aggregate(args.segments, parse_time(args.since), parse_time(args.until), args.top)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+# banking_bot/logging/columnar.py
+"""
+Columnar compaction of chatlogs.jsonl into NumPy segment directories.
+
+Each segment is a directory of .npy files, one per column, plus meta.json:
+- ts (int64, epoch ms), latency_ms (int32), risk_flag / sensitive_flag (bool)
+- cache_hit, fast_path (int8: 1, 0, -1 = not recorded)
+- intent, guardrail, model: int32 codes into a per-segment dictionary
+- stage_<name> (float32 ms, NaN when the stage did not run) for every stage
+  found in extra["timings_ms"]
+
+meta.json also records the source file (by a fingerprint of its first line,
+so renames by log rotation do not matter) and the byte range consumed.
+Compaction resumes from the end of the last segment of every source file.
+"""
+from __future__ import annotations
+import glob
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from .. import config
+
+STRING_COLUMNS = ("intent", "guardrail", "model")
+META = "meta.json"
+_READ_CHUNK = 8 * 1024 * 1024
+
+
+def _fingerprint(path: str) -> Optional[str]:
+    # first line = first record (unique id + timestamp), unchanged by rename
+    with open(path, "rb") as f:
+        head = f.readline(4096)
+    if not head.endswith(b"\n"):
+        return None
+    return hashlib.sha1(head).hexdigest()
+
+
+def _to_epoch_ms(timestamp: str | None) -> int:
+    # ValueError marks the line as not an InteractionLogger record
+    if not timestamp:
+        raise ValueError("record without timestamp")
+    return int(datetime.fromisoformat(timestamp).timestamp() * 1000)
+
+
+class _SegmentBuilder:
+    """
+    Accumulates parsed records column by column and writes one segment.
+    """
+
+    def __init__(self) -> None:
+        self.ts: List[int] = []
+        self.latency: List[int] = []
+        self.risk: List[bool] = []
+        self.sensitive: List[bool] = []
+        self.cache_hit: List[int] = []
+        self.fast_path: List[int] = []
+        self.codes: Dict[str, List[int]] = {c: [] for c in STRING_COLUMNS}
+        self.dicts: Dict[str, Dict[str, int]] = {c: {} for c in STRING_COLUMNS}
+        self.stages: Dict[str, List[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """
+        Append one record. Every field is parsed before any column is touched,
+        so a record that raises (ValueError / TypeError: not an
+        InteractionLogger record) leaves the columns aligned.
+        """
+        if not isinstance(record, dict):
+            raise TypeError("record is not an object")
+        ts = _to_epoch_ms(record.get("timestamp"))
+        latency = int(record.get("latency_ms") or 0)
+        extra = record.get("extra") or {}
+        if not isinstance(extra, dict):
+            raise TypeError("extra is not an object")
+        hit = extra.get("cache_hit")
+        fast_path = extra.get("fast_path")
+        strings = {
+            "intent": record.get("intent") or "",
+            "guardrail": record.get("guardrail_triggered") or "",
+            "model": record.get("model") or "",
+        }
+        if not all(isinstance(v, str) for v in strings.values()):
+            raise TypeError("string column with a non-string value")
+        timings = extra.get("timings_ms") or {}
+        if not isinstance(timings, dict):
+            raise TypeError("timings_ms is not an object")
+        stage_ms = {stage: float(ms) for stage, ms in timings.items()}
+
+        row = len(self.ts)
+        self.ts.append(ts)
+        self.latency.append(latency)
+        self.risk.append(bool(record.get("risk_flag")))
+        self.sensitive.append(bool(record.get("sensitive_flag")))
+        self.cache_hit.append(-1 if hit is None else int(bool(hit)))
+        self.fast_path.append(-1 if not isinstance(fast_path, dict) else int(bool(fast_path.get("used"))))
+        for col, value in strings.items():
+            codes = self.dicts[col]
+            self.codes[col].append(codes.setdefault(value, len(codes)))
+        for stage, ms in stage_ms.items():
+            column = self.stages.get(stage)
+            if column is None:
+                column = self.stages[stage] = [float("nan")] * row
+            column.append(ms)
+        for column in self.stages.values():
+            if len(column) == row:
+                column.append(float("nan"))
+
+    def write(self, segment_dir: str, source: Dict[str, Any]) -> str:
+        name = f"seg-{min(self.ts)}-{uuid.uuid4().hex[:8]}"
+        tmp = os.path.join(segment_dir, f".{name}.tmp")
+        os.makedirs(tmp)
+        columns = {
+            "ts": np.asarray(self.ts, dtype=np.int64),
+            "latency_ms": np.asarray(self.latency, dtype=np.int32),
+            "risk_flag": np.asarray(self.risk, dtype=bool),
+            "sensitive_flag": np.asarray(self.sensitive, dtype=bool),
+            "cache_hit": np.asarray(self.cache_hit, dtype=np.int8),
+            "fast_path": np.asarray(self.fast_path, dtype=np.int8),
+        }
+        for col in STRING_COLUMNS:
+            columns[col] = np.asarray(self.codes[col], dtype=np.int32)
+        for stage, values in self.stages.items():
+            columns[f"stage_{stage}"] = np.asarray(values, dtype=np.float32)
+        for col, arr in columns.items():
+            np.save(os.path.join(tmp, f"{col}.npy"), arr)
+
+        meta = {
+            "rows": len(self.ts),
+            "min_ts": int(columns["ts"].min()),
+            "max_ts": int(columns["ts"].max()),
+            "columns": sorted(columns),
+            "dictionaries": {col: list(self.dicts[col]) for col in STRING_COLUMNS},
+            "source": source,
+        }
+        with open(os.path.join(tmp, META), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        # the segment only becomes visible once complete
+        os.rename(tmp, os.path.join(segment_dir, name))
+        return name
+
+
+class Segment:
+    """
+    A compacted segment; columns are loaded as read-only memory maps.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(os.path.join(path, META), "r", encoding="utf-8") as f:
+            self.meta: Dict[str, Any] = json.load(f)
+
+    @property
+    def rows(self) -> int:
+        return self.meta["rows"]
+
+    def has(self, column: str) -> bool:
+        return column in self.meta["columns"]
+
+    def column(self, name: str) -> np.ndarray:
+        return np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+
+    def dictionary(self, column: str) -> List[str]:
+        return self.meta["dictionaries"][column]
+
+    def overlaps(self, start_ms: Optional[int], end_ms: Optional[int]) -> bool:
+        if start_ms is not None and self.meta["max_ts"] < start_ms:
+            return False
+        if end_ms is not None and self.meta["min_ts"] >= end_ms:
+            return False
+        return True
+
+    def time_mask(self, start_ms: Optional[int], end_ms: Optional[int]) -> Optional[np.ndarray]:
+        """Row mask for [start_ms, end_ms), or None when every row matches."""
+        if (start_ms is None or self.meta["min_ts"] >= start_ms) and (
+            end_ms is None or self.meta["max_ts"] < end_ms
+        ):
+            return None
+        ts = self.column("ts")
+        mask = np.ones(ts.shape[0], dtype=bool)
+        if start_ms is not None:
+            mask &= ts >= start_ms
+        if end_ms is not None:
+            mask &= ts < end_ms
+        return mask
+
+
+def list_segments(segment_dir: str | None = None) -> List[Segment]:
+    segment_dir = segment_dir or config.LOG_SEGMENT_DIR
+    if not os.path.isdir(segment_dir):
+        return []
+    names = sorted(n for n in os.listdir(segment_dir) if n.startswith("seg-"))
+    return [Segment(os.path.join(segment_dir, n)) for n in names]
+
+
+def _consumed_offsets(segments: List[Segment]) -> Dict[str, int]:
+    offsets: Dict[str, int] = {}
+    for seg in segments:
+        source = seg.meta.get("source") or {}
+        fp = source.get("fingerprint")
+        if fp:
+            offsets[fp] = max(offsets.get(fp, 0), int(source.get("end", 0)))
+    return offsets
+
+
+def _iter_lines(path: str, start: int) -> Iterator[Tuple[bytes, int]]:
+    """Complete lines from byte offset `start`, with the offset after each."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        pos = start
+        pending = b""
+        while True:
+            chunk = f.read(_READ_CHUNK)
+            if not chunk:
+                return  # a trailing partial line is still being written
+            pending += chunk
+            lines = pending.split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                pos += len(line) + 1
+                yield line, pos
+
+
+def _source(fingerprint: str, path: str, start: int, end: int) -> Dict[str, Any]:
+    return {"fingerprint": fingerprint, "file": os.path.basename(path), "start": start, "end": end}
+
+
+def compact_logs(
+    log_path: str | None = None,
+    segment_dir: str | None = None,
+    max_rows: int | None = None,
+) -> Dict[str, Any]:
+    """
+    Append everything logged since the last run (the live file and rotated
+    copies next to it) as new segments. Returns counts for reporting.
+    """
+    log_path = log_path or config.LOG_FILE
+    segment_dir = segment_dir or config.LOG_SEGMENT_DIR
+    max_rows = max_rows or config.LOG_SEGMENT_MAX_ROWS
+    os.makedirs(segment_dir, exist_ok=True)
+
+    offsets = _consumed_offsets(list_segments(segment_dir))
+    written: List[str] = []
+    rows = bad = 0
+
+    for path in sorted(glob.glob(glob.escape(log_path) + "*")):
+        if not os.path.isfile(path):
+            continue
+        fp = _fingerprint(path)
+        if fp is None:
+            continue
+        start = offsets.get(fp, 0)
+        if os.path.getsize(path) <= start:
+            continue
+
+        builder = _SegmentBuilder()
+        seg_start = start
+        end = start
+        for line, end in _iter_lines(path, start):
+            if not line.strip():
+                continue
+            try:
+                builder.add(json.loads(line))
+            except (ValueError, TypeError, AttributeError):
+                bad += 1
+                continue
+            if len(builder) >= max_rows:
+                written.append(builder.write(segment_dir, _source(fp, path, seg_start, end)))
+                rows += len(builder)
+                builder = _SegmentBuilder()
+                seg_start = end
+        if len(builder):
+            written.append(builder.write(segment_dir, _source(fp, path, seg_start, end)))
+            rows += len(builder)
+
+    return {"segments": written, "rows": rows, "skipped_lines": bad}
@@ -1,6 +1,13 @@
 # banking_bot/logging/logger.py
+import atexit
 import json
+import os
+import queue
+import threading
+import time
 from datetime import datetime, timezone
+from typing import Any, Dict, List
+from ..forksafe import PerProcess
 from ..models import InteractionLog
 from .. import config
 
@@ -8,10 +15,22 @@ from .. import config
 class InteractionLogger:
     """
     Single-responsibility: persist InteractionLog entries.
+
+    In async mode (config.LOG_ASYNC) log() only enqueues the record; a
+    background thread writes queued records in batches with one append per
+    batch, rotates the file by size/time and flushes on shutdown.
     """
 
-    def __init__(self, path: str | None = None) -> None:
+    def __init__(self, path: str | None = None, async_mode: bool | None = None) -> None:
         self._path = path or config.LOG_FILE
+        self._async = config.LOG_ASYNC if async_mode is None else async_mode
+        self._block_when_full = config.LOG_QUEUE_FULL_POLICY == "block"
+        self._queue: PerProcess["queue.Queue[Any]"] = PerProcess(self._start_worker)
+        self._period = self._current_period()
+        self.dropped = 0
+        self.written = 0
+        if self._async:
+            atexit.register(self.close)
 
     def log(self, entry: InteractionLog) -> None:
         record = {
@@ -28,5 +47,112 @@ class InteractionLogger:
             "guardrail_triggered": entry.guardrail_triggered,
             "extra": entry.extra,
         }
-        with open(self._path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if not self._async:
+            self._write([record])
+            return
+
+        q = self._queue.get()
+        try:
+            if self._block_when_full:
+                q.put(record)
+            else:
+                q.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Block until everything logged so far is on disk.
+        """
+        q = self._queue.current() if self._async else None
+        if q is None:
+            return True
+        done = threading.Event()
+        q.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        self.flush(timeout=5.0)
+
+    def _start_worker(self) -> "queue.Queue[Any]":
+        q: "queue.Queue[Any]" = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+        threading.Thread(target=self._run, args=(q,), name="interaction-logger", daemon=True).start()
+        return q
+
+    def _run(self, q: "queue.Queue[Any]") -> None:
+        while True:
+            batch: List[Dict[str, Any]] = []
+            waiters: List[threading.Event] = []
+            item = q.get()
+            deadline = time.monotonic() + config.LOG_FLUSH_INTERVAL_S
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= config.LOG_BATCH_MAX:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    print("Interaction log write error:", e)
+            for w in waiters:
+                w.set()
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8")
+        self._maybe_rotate()
+        # a single O_APPEND write per batch keeps lines from different
+        # processes from interleaving
+        fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                n = os.write(fd, view)
+                view = view[n:]
+            if config.LOG_FSYNC == "batch":
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        self.written += len(records)
+
+    def _current_period(self) -> int:
+        interval = config.LOG_ROTATE_INTERVAL_S
+        return int(time.time() // interval) if interval > 0 else 0
+
+    def _maybe_rotate(self) -> None:
+        period = self._current_period()
+        if period != self._period:
+            # time-based: the name is derived from the period that just ended, so
+            # when several workers roll over together only the first one renames
+            ended = datetime.fromtimestamp(self._period * config.LOG_ROTATE_INTERVAL_S, timezone.utc)
+            self._period = period
+            self._rotate(f"{self._path}.{ended.strftime('%Y%m%d-%H%M%S')}")
+            return
+
+        if config.LOG_ROTATE_MAX_BYTES > 0:
+            try:
+                too_big = os.path.getsize(self._path) >= config.LOG_ROTATE_MAX_BYTES
+            except OSError:
+                return
+            if too_big:
+                stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S-%f")
+                self._rotate(f"{self._path}.{stamp}")
+
+    def _rotate(self, target: str) -> None:
+        # another process may have rotated already; never overwrite its file
+        if os.path.exists(target):
+            return
+        try:
+            os.rename(self._path, target)
+        except OSError:
+            pass
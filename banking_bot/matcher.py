@@ -0,0 +1,89 @@
+# banking_bot/matcher.py
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from . import config
+
+
+class KeywordMatcher:
+    """
+    Single-responsibility: find every labelled keyword that occurs in a text.
+
+    Aho-Corasick automaton: built once from {label: [keywords]}, then a single
+    pass over the text reports all hits, so the cost per message does not grow
+    with the number of keywords. Matching is plain substring matching (same
+    semantics as `kw in text`); callers pass lowercased text.
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, str]]] = [[]]
+
+        for label, keywords in patterns.items():
+            for kw in keywords:
+                if kw:
+                    self._add(label, kw.lower())
+        self._build_failure_links()
+
+    def _add(self, label: str, kw: str) -> None:
+        state = 0
+        for ch in kw:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((label, kw))
+
+    def _build_failure_links(self) -> None:
+        # breadth-first; depth-1 states keep their failure link to the root
+        todo = deque(self._goto[0].values())
+        while todo:
+            state = todo.popleft()
+            for ch, nxt in self._goto[state].items():
+                todo.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Dict[str, List[str]]:
+        """
+        Return {label: [matched keywords]} in order of first occurrence.
+        """
+        hits: Dict[str, List[str]] = {}
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for label, kw in out[state]:
+                found = hits.setdefault(label, [])
+                if kw not in found:
+                    found.append(kw)
+        return hits
+
+
+def intent_label(intent: str) -> str:
+    return f"intent:{intent}"
+
+
+@lru_cache(maxsize=1)
+def get_keyword_matcher() -> KeywordMatcher:
+    """
+    Shared matcher over all safety and intent keyword lists in config.
+    Labels: "risky", "sensitive" and "intent:<name>".
+    """
+    patterns: Dict[str, List[str]] = {
+        "risky": config.RISKY_KEYWORDS,
+        "sensitive": config.SENSITIVE_KEYWORDS,
+    }
+    for intent, keywords in config.INTENT_KEYWORDS.items():
+        patterns[intent_label(intent)] = keywords
+    return KeywordMatcher(patterns)
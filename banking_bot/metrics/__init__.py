@@ -0,0 +1,4 @@
+# banking_bot/metrics/__init__.py
+from .registry import MetricsRegistry, Counter, Histogram, StageTimer, REGISTRY
+
+__all__ = ["MetricsRegistry", "Counter", "Histogram", "StageTimer", "REGISTRY"]
@@ -0,0 +1,198 @@
+# banking_bot/metrics/registry.py
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# milliseconds; covers in-process stages (sub-ms) up to slow LLM calls
+DEFAULT_BUCKETS_MS: Tuple[float, ...] = (
+    0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000,
+)
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels.
+    """
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels.get(n, "")) for n in self.labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_fmt_labels(self.labels, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram (Prometheus semantics) with optional labels.
+    observe() is a bisect plus a few additions under a lock.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS_MS,
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., +Inf count], sum, count
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+                self._series[key] = series
+            series[0][slot] += 1
+            series[1][0] += value
+            series[1][1] += 1
+
+    def snapshot(self) -> Dict[LabelValues, Tuple[List[int], float, int]]:
+        with self._lock:
+            return {k: (list(c), s[0], int(s[1])) for k, (c, s) in self._series.items()}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, n) in self.snapshot().items():
+            cumulative = 0
+            for bound, c in zip(self.buckets, counts):
+                cumulative += c
+                le = 'le="%g"' % bound
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, key, le)} {cumulative}")
+            inf = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, key, inf)} {n}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labels, key)} {total:g}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labels, key)} {n}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Single-responsibility: hold process-local metrics and render them in the
+    Prometheus text exposition format.
+
+    Gauges are callbacks evaluated at scrape time, so components such as caches
+    only need to expose their own stats().
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, object] = {}
+        self._gauges: Dict[str, Tuple[str, Sequence[str], Callable[[], Dict[LabelValues, float]]]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Counter(name, help_text, labels)
+            return metric
+
+    def histogram(
+        self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS_MS
+    ) -> Histogram:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(name, help_text, labels, buckets)
+            return metric
+
+    def gauge_callback(
+        self, name: str, help_text: str, labels: Sequence[str], fn: Callable[[], Dict[LabelValues, float]]
+    ) -> None:
+        """Register (or replace) a gauge whose values come from fn() at scrape time."""
+        with self._lock:
+            self._gauges[name] = (help_text, tuple(labels), fn)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            gauges = list(self._gauges.items())
+        for metric in metrics:
+            lines.extend(metric.render())
+        for name, (help_text, labels, fn) in gauges:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            try:
+                values = fn()
+            except Exception as e:
+                print("Metrics gauge error:", name, e)
+                continue
+            for key, value in values.items():
+                lines.append(f"{name}{_fmt_labels(labels, key)} {float(value):g}")
+        return "\n".join(lines) + "\n"
+
+
+class StageTimer:
+    """
+    Records per-stage wall time with a monotonic clock:
+
+        with timer.stage("embed"):
+            ...
+
+    timings holds milliseconds per stage name (repeated stages accumulate).
+    """
+
+    def __init__(self) -> None:
+        self.timings: Dict[str, float] = {}
+        self._name = ""
+        self._start = 0.0
+
+    def stage(self, name: str) -> "StageTimer":
+        self._name = name
+        return self
+
+    def __enter__(self) -> "StageTimer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = (time.perf_counter() - self._start) * 1000
+        self.timings[self._name] = self.timings.get(self._name, 0.0) + elapsed
+
+    def add(self, name: str, ms: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + ms
+
+    def rounded(self) -> Dict[str, float]:
+        return {k: round(v, 2) for k, v in self.timings.items()}
+
+
+REGISTRY = MetricsRegistry()
@@ -23,6 +23,15 @@ class SafetyResult:
     category: str                 # "allowed" | "risky" | "sensitive"
     message: Optional[str] = None  # refusal message if not allowed
     flags: Optional[Dict[str, bool]] = None
+    keyword_hits: Optional[Dict[str, List[str]]] = None  # label → matched keywords
+
+
+@dataclass
+class LLMResult:
+    text: str
+    context: Optional[List[int]] = None  # backend state to continue the conversation from
+    backend: Optional[str] = None         # which backend served the call
+    failed: bool = False                  # error (also mid-stream): text is not a complete answer
 
 
 @dataclass
@@ -1,6 +1,9 @@
 # banking_bot/rag/__init__.py
 from .corpus_loader import load_policy_snippets
 from .embeddings import EmbeddingProvider
+from .embedding_store import EmbeddingStore
+from .index import VectorIndex, BruteForceIndex, IVFIndex, QuantizedIndex, build_index
 from .retriever import Retriever
+from .ingest import CorpusIngestor
 
-__all__ = ["load_policy_snippets", "EmbeddingProvider", "Retriever"]
+__all__ = ["load_policy_snippets", "EmbeddingProvider", "EmbeddingStore", "VectorIndex", "BruteForceIndex", "IVFIndex", "QuantizedIndex", "build_index", "Retriever", "CorpusIngestor"]
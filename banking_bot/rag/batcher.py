@@ -0,0 +1,107 @@
+# banking_bot/rag/batcher.py
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Tuple
+import numpy as np
+from ..forksafe import PerProcess
+
+_Request = Tuple[List[str], Future, float]  # texts, caller's future, enqueue time
+
+
+class MicroBatcher:
+    """
+    Single-responsibility: coalesce concurrent encode calls into one batched
+    model call.
+
+    Callers block on their own Future while a background thread collects
+    requests for up to `max_wait_ms` or `max_batch` texts, runs `encode_fn`
+    once and hands each caller its own rows.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        max_batch: int,
+        max_wait_ms: float,
+    ) -> None:
+        self._encode_fn = encode_fn
+        self._max_batch = max_batch
+        self._max_wait_s = max_wait_ms / 1000.0
+        self._queue: PerProcess["queue.Queue[_Request]"] = PerProcess(self._start_worker)
+
+        # metrics
+        self.batches = 0
+        self.requests = 0
+        self.items = 0
+        self.max_batch_seen = 0
+        self.queue_wait_s_total = 0.0
+        self.queue_wait_s_max = 0.0
+
+    @property
+    def max_batch(self) -> int:
+        return self._max_batch
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        fut: Future = Future()
+        self._queue.get().put((texts, fut, time.perf_counter()))
+        return fut.result()
+
+    def _start_worker(self) -> "queue.Queue[_Request]":
+        q: "queue.Queue[_Request]" = queue.Queue()
+        threading.Thread(target=self._run, args=(q,), name="embed-batcher", daemon=True).start()
+        return q
+
+    def _run(self, q: "queue.Queue[_Request]") -> None:
+        while True:
+            batch = [q.get()]
+            n = len(batch[0][0])
+            deadline = time.perf_counter() + self._max_wait_s
+            while n < self._max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                n += len(item[0])
+            self._process(batch, n)
+
+    def _process(self, batch: List[Tuple[List[str], Future, float]], n: int) -> None:
+        started = time.perf_counter()
+        texts: List[str] = []
+        for item_texts, _, enqueued in batch:
+            texts.extend(item_texts)
+            wait = started - enqueued
+            self.queue_wait_s_total += wait
+            self.queue_wait_s_max = max(self.queue_wait_s_max, wait)
+        self.batches += 1
+        self.requests += len(batch)
+        self.items += n
+        self.max_batch_seen = max(self.max_batch_seen, n)
+
+        try:
+            vecs = self._encode_fn(texts)
+        except Exception as e:
+            for _, fut, _ in batch:
+                fut.set_exception(e)
+            return
+
+        offset = 0
+        for item_texts, fut, _ in batch:
+            fut.set_result(vecs[offset:offset + len(item_texts)])
+            offset += len(item_texts)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "items": self.items,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "avg_queue_wait_ms": 1000 * self.queue_wait_s_total / self.requests if self.requests else 0.0,
+            "max_queue_wait_ms": 1000 * self.queue_wait_s_max,
+        }
@@ -0,0 +1,211 @@
+# banking_bot/rag/build_index.py
+"""
+Embed the policy corpus with a pool of worker processes and publish the
+vectors to the EmbeddingStore, so servers start without encoding anything.
+
+    python -m banking_bot.rag.build_index
+    python -m banking_bot.rag.build_index --workers 32 --shard-size 256 --policies data/policies
+
+Chunks already in the store (same text, same model) are copied, not
+re-encoded. The rest is split into shards; each worker loads the model once
+and writes its shard straight into a preallocated memory-mapped matrix.
+Finished shards are recorded in progress.json next to it, so running the
+command again after a crash only encodes the shards that were missing.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from .. import config
+from .corpus_loader import load_policy_snippets, policy_dir
+from .embedding_store import EmbeddingStore, content_hash
+from .embeddings import EmbeddingProvider
+
+PROGRESS = "progress.json"
+VECTORS = "vectors.npy"
+
+# per worker process: the model is loaded once by _init_worker, the output
+# matrix is mapped on first use
+_embedder: Optional[EmbeddingProvider] = None
+_outputs: Dict[str, np.memmap] = {}
+
+
+def _init_worker(model_name: str, threads: int) -> None:
+    global _embedder
+    try:
+        import torch
+
+        # one intra-op thread pool per worker would oversubscribe the cores
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    config.EMBED_BATCHING = False  # shards are already batches
+    _embedder = EmbeddingProvider(model_name)
+    _embedder.load()
+
+
+def _probe_dim(text: str) -> int:
+    return int(_embedder.encode([text]).shape[1])
+
+
+def _encode_shard(out_path: str, shard: int, rows: List[int], texts: List[str]) -> int:
+    out = _outputs.get(out_path)
+    if out is None:
+        out = _outputs[out_path] = np.load(out_path, mmap_mode="r+")
+    vecs = _embedder.encode(texts).astype(np.float32)
+    if rows[-1] - rows[0] == len(rows) - 1:
+        out[rows[0]:rows[-1] + 1] = vecs
+    else:
+        out[rows] = vecs
+    out.flush()  # the parent marks the shard done once this returns
+    return shard
+
+
+def _build_fingerprint(model_name: str, hashes: List[str]) -> str:
+    h = hashlib.sha256(model_name.encode("utf-8"))
+    for ch in hashes:
+        h.update(ch.encode("ascii"))
+    return h.hexdigest()[:16]
+
+
+def _load_progress(build_dir: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(build_dir, PROGRESS), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_progress(build_dir: str, progress: Dict[str, Any]) -> None:
+    tmp = os.path.join(build_dir, f".{PROGRESS}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(progress, f)
+    os.replace(tmp, os.path.join(build_dir, PROGRESS))
+
+
+def _fmt_s(seconds: float) -> str:
+    m, s = divmod(int(seconds), 60)
+    return f"{m}m{s:02d}s" if m else f"{s}s"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--policies", default=None, help="policy directory (default: data/policies)")
+    parser.add_argument("--workers", type=int, default=config.INDEX_BUILD_WORKERS or os.cpu_count() or 1)
+    parser.add_argument("--shard-size", type=int, default=config.INDEX_BUILD_SHARD_SIZE)
+    parser.add_argument("--cache-dir", default=config.EMBED_CACHE_DIR)
+    args = parser.parse_args()
+
+    snippets = load_policy_snippets(args.policies)
+    if not snippets:
+        sys.exit(f"no policy chunks found in {args.policies or policy_dir()}: nothing to index")
+    texts = [s.text for s in snippets]
+    hashes = [content_hash(t) for t in texts]
+    embedder = EmbeddingProvider()  # only for the model name: workers load the model
+    model_name = embedder.model_name
+    store = EmbeddingStore(embedder, root=args.cache_dir)
+
+    stored_hashes, stored = store.load()
+    if stored is not None and stored_hashes == hashes:
+        print(f"{len(texts)} chunks already indexed in {store.directory}")
+        return
+
+    fingerprint = _build_fingerprint(model_name, hashes)
+    build_dir = os.path.join(store.directory, f"build-{fingerprint}")
+    out_path = os.path.join(build_dir, VECTORS)
+    # shard layout depends on which rows the store already had
+    base = _build_fingerprint(model_name, stored_hashes)
+    progress = _load_progress(build_dir)
+    if progress is not None and progress.get("base") == base and os.path.exists(out_path):
+        print(f"resuming {build_dir}: {len(progress['done'])}/{progress['shards']} shard(s) done")
+    else:
+        progress = None
+        shutil.rmtree(build_dir, ignore_errors=True)
+    # builds for an older corpus can never be resumed
+    for name in os.listdir(store.directory) if os.path.isdir(store.directory) else []:
+        if name.startswith("build-") and name != f"build-{fingerprint}":
+            shutil.rmtree(os.path.join(store.directory, name), ignore_errors=True)
+
+    row_of = {h: i for i, h in enumerate(stored_hashes)}
+    todo = [i for i, h in enumerate(hashes) if h not in row_of]
+    shard_size = progress["shard_size"] if progress else max(1, args.shard_size)
+    shards = [todo[i:i + shard_size] for i in range(0, len(todo), shard_size)]
+    done: Set[int] = set(progress["done"]) if progress else set()
+    remaining = [k for k in range(len(shards)) if k not in done]
+
+    workers = max(1, min(args.workers, len(remaining) or 1))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    # spawn, not fork: the model libraries' thread pools do not survive fork()
+    ctx = multiprocessing.get_context("spawn")
+    pool: Optional[ProcessPoolExecutor] = None
+    try:
+        if progress is None:
+            if stored is not None:
+                dim = stored.shape[1]
+            else:
+                # the dimension is only known once a worker has loaded the model
+                pool = ProcessPoolExecutor(workers, ctx, _init_worker, (model_name, threads))
+                dim = pool.submit(_probe_dim, texts[0]).result()
+            os.makedirs(build_dir, exist_ok=True)
+            out = open_memmap(out_path, mode="w+", dtype=np.float32, shape=(len(texts), dim))
+            reused = [i for i, h in enumerate(hashes) if h in row_of]
+            if reused:
+                out[reused] = stored[[row_of[hashes[i]] for i in reused]]
+            out.flush()
+            del out
+            progress = {"fingerprint": fingerprint, "base": base, "shard_size": shard_size, "shards": len(shards), "done": []}
+            _save_progress(build_dir, progress)
+            print(f"{len(texts)} chunks: {len(texts) - len(todo)} reused, "
+                  f"{len(todo)} to encode in {len(shards)} shard(s) of {shard_size}")
+
+        if remaining:
+            if pool is None:
+                pool = ProcessPoolExecutor(workers, ctx, _init_worker, (model_name, threads))
+            print(f"encoding with {workers} worker(s), {threads} thread(s) each")
+            rows_left = sum(len(shards[k]) for k in remaining)
+            rows_done = 0
+            started = time.perf_counter()
+            pending = {
+                pool.submit(_encode_shard, out_path, k, shards[k], [texts[i] for i in shards[k]]): k
+                for k in remaining
+            }
+            last_report = 0.0
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    k = pending.pop(future)
+                    future.result()
+                    done.add(k)
+                    rows_done += len(shards[k])
+                progress["done"] = sorted(done)
+                _save_progress(build_dir, progress)
+                now = time.perf_counter()
+                if now - last_report >= 1.0 or not pending:
+                    last_report = now
+                    rate = rows_done / max(now - started, 1e-9)
+                    eta = (rows_left - rows_done) / rate if rate else 0.0
+                    print(f"  {len(done)}/{len(shards)} shards  {rows_done}/{rows_left} rows  "
+                          f"{rate:.0f} rows/s  eta {_fmt_s(eta)}", file=sys.stderr)
+            elapsed = time.perf_counter() - started
+            print(f"encoded {rows_left} chunks in {elapsed:.1f}s ({rows_left / max(elapsed, 1e-9):.0f} rows/s)")
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    store.publish(hashes, out_path)
+    shutil.rmtree(build_dir, ignore_errors=True)
+    print(f"published {len(texts)} vectors to {store.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,80 @@
 # banking_bot/rag/corpus_loader.py
 import os
 import glob
-from typing import List
+from typing import Iterator, List, Tuple
 from ..models import Snippet
 from .. import config
 
 
-def load_policy_snippets() -> List[Snippet]:
-    policy_dir = os.path.join("data", "policies")
-    snippets: List[Snippet] = []
+def policy_dir() -> str:
+    return os.path.join("data", "policies")
+
+
+def iter_policy_files(directory: str | None = None) -> Iterator[str]:
+    for path in sorted(glob.glob(os.path.join(directory or policy_dir(), "*.txt"))):
+        yield path
+
+
+def file_signature(path: str) -> Tuple[int, int]:
+    """Cheap change detector for a corpus file: (mtime_ns, size)."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def iter_paragraphs(path: str) -> Iterator[str]:
+    """
+    Stream blank-line separated paragraphs without reading the whole file.
+    """
+    lines: List[str] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                lines.append(line.rstrip("\n"))
+            elif lines:
+                yield "\n".join(lines).strip()
+                lines = []
+    if lines:
+        yield "\n".join(lines).strip()
 
-    if os.path.isdir(policy_dir):
-        for path in glob.glob(os.path.join(policy_dir, "*.txt")):
-            with open(path, "r", encoding="utf-8") as f:
-                text = f.read().strip()
-            if not text:
+
+def iter_token_windows(text: str, window: int, overlap: int) -> Iterator[str]:
+    """
+    Split text into windows of at most `window` whitespace tokens, each
+    sharing `overlap` tokens with the previous one. Short text is one window.
+    """
+    tokens = text.split()
+    if len(tokens) <= window:
+        yield text
+        return
+    step = max(1, window - overlap)
+    for start in range(0, len(tokens), step):
+        yield " ".join(tokens[start:start + window])
+        if start + window >= len(tokens):
+            break
+
+
+def iter_file_snippets(path: str) -> Iterator[Snippet]:
+    """
+    One snippet per paragraph; paragraphs longer than config.CHUNK_TOKENS are
+    cut into overlapping token windows.
+    """
+    base = os.path.basename(path)
+    for i, para in enumerate(iter_paragraphs(path)):
+        windows = list(iter_token_windows(para, config.CHUNK_TOKENS, config.CHUNK_OVERLAP_TOKENS))
+        for j, chunk in enumerate(windows):
+            if len(chunk) < 40:
                 continue
-            base = os.path.basename(path)
-            for i, chunk in enumerate(text.split("\n\n")):
-                chunk = chunk.strip()
-                if len(chunk) < 40:
-                    continue
-                snippets.append(
-                    Snippet(
-                        id=f"{base}_{i}",
-                        text=chunk,
-                        source=base
-                    )
-                )
+            snippet_id = f"{base}_{i}" if len(windows) == 1 else f"{base}_{i}_{j}"
+            yield Snippet(id=snippet_id, text=chunk, source=base)
+
+
+def load_policy_snippets(directory: str | None = None) -> List[Snippet]:
+    directory = directory or policy_dir()
+    snippets: List[Snippet] = []
+
+    if os.path.isdir(directory):
+        for path in iter_policy_files(directory):
+            snippets.extend(iter_file_snippets(path))
     else:
         snippets = list(config.DEFAULT_SNIPPETS)
 
@@ -0,0 +1,132 @@
+# banking_bot/rag/embedding_store.py
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .. import config
+from .embeddings import EmbeddingProvider
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Single-responsibility: persist corpus embeddings on disk so that only new or
+    changed chunks are re-encoded when a process starts.
+
+    Layout (one directory per embedding model):
+    - manifest.json: {"file": "vectors-<id>.npy", "hashes": [...]} in row order
+    - vectors-<id>.npy: float32 matrix, loaded with a memory map
+
+    The manifest is replaced atomically, so concurrent workers always see a
+    consistent (hashes, vectors) pair.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, embedder: EmbeddingProvider, root: str | None = None) -> None:
+        self._embedder = embedder
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", embedder.model_name)
+        self._dir = os.path.join(root or config.EMBED_CACHE_DIR, safe_name)
+
+    @property
+    def directory(self) -> str:
+        return self._dir
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Same contract as EmbeddingProvider.encode, backed by the on-disk store.
+        """
+        if not texts:
+            return self._embedder.encode(texts)
+
+        hashes = [content_hash(t) for t in texts]
+        stored_hashes, stored = self.load()
+        if stored is not None and stored_hashes == hashes:
+            return stored
+
+        row_of = {h: i for i, h in enumerate(stored_hashes)}
+        missing: Dict[str, int] = {}
+        for i, h in enumerate(hashes):
+            if h not in row_of and h not in missing:
+                missing[h] = i
+
+        new_vecs: Optional[np.ndarray] = None
+        if missing:
+            new_vecs = self._embedder.encode([texts[i] for i in missing.values()]).astype(np.float32)
+        dim = stored.shape[1] if stored is not None else new_vecs.shape[1]
+
+        out = np.empty((len(texts), dim), dtype=np.float32)
+        new_row_of = {h: j for j, h in enumerate(missing)}
+        for i, h in enumerate(hashes):
+            if h in new_row_of:
+                out[i] = new_vecs[new_row_of[h]]
+            else:
+                out[i] = stored[row_of[h]]
+
+        self.save(hashes, out)
+        # hand out the memory-mapped copy: pages come from the OS page cache,
+        # shared by all workers, instead of each process's heap
+        saved_hashes, saved = self.load()
+        return saved if saved is not None and saved_hashes == hashes else out
+
+    def load(self) -> Tuple[List[str], Optional[np.ndarray]]:
+        manifest_path = os.path.join(self._dir, self.MANIFEST)
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            vecs = np.load(os.path.join(self._dir, manifest["file"]), mmap_mode="r")
+        except (OSError, ValueError, KeyError) as e:
+            if os.path.exists(manifest_path):
+                print("Embedding store unreadable, rebuilding:", e)
+            return [], None
+
+        hashes = manifest.get("hashes", [])
+        if vecs.ndim != 2 or vecs.shape[0] != len(hashes):
+            return [], None
+        return hashes, vecs
+
+    def save(self, hashes: List[str], vecs: np.ndarray) -> None:
+        os.makedirs(self._dir, exist_ok=True)
+        vec_file = f"vectors-{uuid.uuid4().hex}.npy"
+        np.save(os.path.join(self._dir, vec_file), np.ascontiguousarray(vecs, dtype=np.float32))
+        self._publish(hashes, vec_file)
+
+    def publish(self, hashes: List[str], npy_path: str) -> None:
+        """
+        Adopt a float32 .npy matrix written elsewhere (e.g. by the parallel
+        indexer) as the stored vectors for `hashes`. The file is moved, so it
+        should be on the same filesystem as the store.
+        """
+        os.makedirs(self._dir, exist_ok=True)
+        vec_file = f"vectors-{uuid.uuid4().hex}.npy"
+        os.replace(npy_path, os.path.join(self._dir, vec_file))
+        self._publish(hashes, vec_file)
+
+    def _publish(self, hashes: List[str], vec_file: str) -> None:
+        tmp_manifest = os.path.join(self._dir, f".{vec_file}.manifest.tmp")
+        with open(tmp_manifest, "w", encoding="utf-8") as f:
+            json.dump({"model": self._embedder.model_name, "file": vec_file, "hashes": hashes}, f)
+        os.replace(tmp_manifest, os.path.join(self._dir, self.MANIFEST))
+
+        self._cleanup(keep=vec_file)
+
+    def _cleanup(self, keep: str, min_age_s: float = 60.0) -> None:
+        # Old vector files stay valid for processes that already mapped them;
+        # recently written ones may belong to a worker that is about to publish.
+        now = time.time()
+        for name in os.listdir(self._dir):
+            if not name.startswith("vectors-") or name == keep:
+                continue
+            path = os.path.join(self._dir, name)
+            try:
+                if now - os.path.getmtime(path) > min_age_s:
+                    os.remove(path)
+            except OSError:
+                pass
@@ -1,19 +1,97 @@
 # banking_bot/rag/embeddings.py
-from typing import List
+import threading
+from typing import Any, Dict, List
 import numpy as np
 from sentence_transformers import SentenceTransformer
+from .. import config
+from ..cache import LRUCache
+from .batcher import MicroBatcher
 
 
 class EmbeddingProvider:
     """
     Single-responsibility: turn texts into normalized vectors.
     Wraps SentenceTransformer to allow easy swap later.
+
+    The model is loaded on first use (or by load()), so processes that find
+    all corpus vectors in the EmbeddingStore start without touching it.
     """
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2") -> None:
-        self._model = SentenceTransformer(model_name)
+    def __init__(self, model_name: str | None = None) -> None:
+        self._model_name = model_name or config.EMBED_MODEL_NAME
+        self._model: SentenceTransformer | None = None
+        self._model_lock = threading.Lock()
+        self._query_cache = LRUCache(config.EMBED_QUERY_CACHE_SIZE, config.EMBED_QUERY_CACHE_TTL_S)
+        self._batcher = (
+            MicroBatcher(self._encode_now, config.EMBED_BATCH_MAX_SIZE, config.EMBED_BATCH_MAX_WAIT_MS)
+            if config.EMBED_BATCHING
+            else None
+        )
+
+    @property
+    def model_name(self) -> str:
+        return self._model_name
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self) -> SentenceTransformer:
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = SentenceTransformer(self._model_name)
+        return self._model
 
     def encode(self, texts: List[str]) -> np.ndarray:
-        vecs = self._model.encode(texts, convert_to_numpy=True)
+        # small requests (queries) go through the micro-batcher; corpus-sized
+        # requests are already batched and run directly
+        if self._batcher is not None and 0 < len(texts) < self._batcher.max_batch:
+            return self._batcher.encode(texts)
+        return self._encode_now(texts)
+
+    def _encode_now(self, texts: List[str]) -> np.ndarray:
+        vecs = self.load().encode(texts, convert_to_numpy=True)
         norms = np.linalg.norm(vecs, axis=1, keepdims=True) + 1e-9
         return vecs / norms
+
+    @staticmethod
+    def _query_key(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def encode_query(self, query: str) -> np.ndarray:
+        """
+        Encode a single query, reusing the vector of an identical (normalized)
+        query seen recently. The returned array is read-only.
+        """
+        key = self._query_key(query)
+        vec = self._query_cache.get(key)
+        if vec is None:
+            vec = self.encode([key])[0]
+            vec.flags.writeable = False
+            self._query_cache.put(key, vec)
+        return vec
+
+    def encode_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Batch form of encode_query: cache misses are encoded in one model call.
+        Row i equals encode_query(queries[i]).
+        """
+        keys = [self._query_key(q) for q in queries]
+        vecs: List[np.ndarray | None] = [self._query_cache.get(k) for k in keys]
+        missing = list(dict.fromkeys(k for k, v in zip(keys, vecs) if v is None))
+        if missing:
+            encoded = dict(zip(missing, self._encode_now(missing)))
+            for k, v in encoded.items():
+                v.flags.writeable = False
+                self._query_cache.put(k, v)
+            vecs = [v if v is not None else encoded[k] for k, v in zip(keys, vecs)]
+        if not vecs:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack(vecs)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self._query_cache.stats()
+
+    def batch_stats(self) -> Dict[str, Any]:
+        return self._batcher.stats() if self._batcher is not None else {}
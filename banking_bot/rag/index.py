@@ -0,0 +1,196 @@
+# banking_bot/rag/index.py
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+import numpy as np
+from .. import config
+from .quantize import QuantizedMatrix
+
+
+def top_k_desc(scores: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Indices and values of the top_k largest scores, best first.
+    Uses argpartition (O(N)) and only sorts the k survivors.
+    """
+    n = scores.shape[0]
+    k = min(top_k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=scores.dtype)
+    if k < n:
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(n)
+    idx = idx[np.argsort(-scores[idx], kind="stable")]
+    return idx, scores[idx]
+
+
+class VectorIndex(ABC):
+    """
+    Interface for nearest-neighbour search over normalized row vectors.
+    """
+
+    @abstractmethod
+    def search(self, q_vec: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (row ids, cosine scores) of the best matches, best first."""
+        ...
+
+    def search_batch(self, q_mat: np.ndarray, top_k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """search() for each row of q_mat."""
+        return [self.search(q, top_k) for q in q_mat]
+
+
+class BruteForceIndex(VectorIndex):
+    """
+    Exact search: score every row, keep the top-k with argpartition.
+    """
+
+    def __init__(self, embeds: np.ndarray) -> None:
+        self._embeds = embeds
+
+    def search(self, q_vec: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        return top_k_desc(self._embeds @ q_vec, top_k)
+
+    def search_batch(self, q_mat: np.ndarray, top_k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        # one matrix multiply for the whole batch
+        scores = self._embeds @ q_mat.T
+        return [top_k_desc(scores[:, j], top_k) for j in range(q_mat.shape[0])]
+
+
+class IVFIndex(VectorIndex):
+    """
+    Approximate search with an inverted file: rows are clustered with spherical
+    k-means and a query only scans the `nprobe` clusters closest to it.
+    Recall is tuned with nprobe (nprobe == nlist is exact).
+    """
+
+    def __init__(
+        self,
+        embeds: np.ndarray,
+        nlist: int | None = None,
+        nprobe: int | None = None,
+        n_iter: int = 10,
+        train_size: int = 256,
+        seed: int = 0,
+    ) -> None:
+        self._embeds = embeds
+        n = embeds.shape[0]
+        nlist = nlist or config.IVF_NLIST or int(np.sqrt(n))
+        self._nlist = max(1, min(nlist, n))
+        self._nprobe = max(1, min(nprobe or config.IVF_NPROBE, self._nlist))
+
+        rng = np.random.default_rng(seed)
+        # train the coarse quantizer on a sample (~train_size rows per list)
+        sample_n = min(n, self._nlist * train_size)
+        sample = np.asarray(embeds[np.sort(rng.choice(n, sample_n, replace=False))], dtype=np.float32)
+        self._centroids = self._kmeans(sample, self._nlist, n_iter, rng)
+
+        assign = self._assign(embeds)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=self._nlist)
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._list_ids = order
+
+    @property
+    def nprobe(self) -> int:
+        return self._nprobe
+
+    @nprobe.setter
+    def nprobe(self, value: int) -> None:
+        self._nprobe = max(1, min(value, self._nlist))
+
+    @staticmethod
+    def _kmeans(x: np.ndarray, k: int, n_iter: int, rng: np.random.Generator) -> np.ndarray:
+        centroids = x[rng.choice(x.shape[0], k, replace=False)].copy()
+        for _ in range(n_iter):
+            assign = np.argmax(x @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, x)
+            counts = np.bincount(assign, minlength=k)
+            empty = counts == 0
+            if empty.any():
+                # re-seed empty lists with random rows
+                sums[empty] = x[rng.choice(x.shape[0], int(empty.sum()))]
+            centroids = sums / (np.linalg.norm(sums, axis=1, keepdims=True) + 1e-9)
+        return centroids
+
+    def _assign(self, embeds: np.ndarray, chunk: int = 65536) -> np.ndarray:
+        out = np.empty(embeds.shape[0], dtype=np.int64)
+        for start in range(0, embeds.shape[0], chunk):
+            block = np.asarray(embeds[start:start + chunk])
+            out[start:start + chunk] = np.argmax(block @ self._centroids.T, axis=1)
+        return out
+
+    def search(self, q_vec: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        probe, _ = top_k_desc(self._centroids @ q_vec, self._nprobe)
+        cand = np.sort(np.concatenate(
+            [self._list_ids[self._offsets[c]:self._offsets[c + 1]] for c in probe]
+        ))
+        if cand.shape[0] < top_k:
+            return top_k_desc(self._embeds @ q_vec, top_k)
+        idx, scores = top_k_desc(self._embeds[cand] @ q_vec, top_k)
+        return cand[idx], scores
+
+
+class QuantizedIndex(VectorIndex):
+    """
+    Exhaustive search over a compressed copy of the rows (float16 or int8,
+    optionally PCA-projected), then exact rescoring of the best `rescore`
+    candidates against the full-precision rows.
+
+    Only the compressed copy has to be resident: when `embeds` is a memory map
+    (EmbeddingStore), rescoring reads just the shortlisted rows from it.
+    """
+
+    def __init__(
+        self,
+        embeds: np.ndarray,
+        dtype: str | None = None,
+        pca_dim: int | None = None,
+        rescore: int | None = None,
+    ) -> None:
+        self._embeds = embeds
+        self._codes = QuantizedMatrix(
+            embeds,
+            dtype=dtype or config.QUANT_DTYPE,
+            pca_dim=config.QUANT_PCA_DIM if pca_dim is None else pca_dim,
+        )
+        self._rescore = config.QUANT_RESCORE if rescore is None else rescore
+
+    @property
+    def nbytes(self) -> int:
+        """Resident memory of the compressed rows."""
+        return self._codes.nbytes
+
+    @property
+    def rescore(self) -> int:
+        return self._rescore
+
+    @rescore.setter
+    def rescore(self, value: int) -> None:
+        self._rescore = max(0, value)
+
+    def _rerank(self, approx: np.ndarray, q_vec: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if self._rescore <= 0:
+            return top_k_desc(approx, top_k)
+        cand, _ = top_k_desc(approx, max(top_k, self._rescore))
+        cand = np.sort(cand)  # ascending row order reads the memory map sequentially
+        idx, scores = top_k_desc(np.asarray(self._embeds[cand], dtype=np.float32) @ q_vec, top_k)
+        return cand[idx], scores
+
+    def search(self, q_vec: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        return self._rerank(self._codes.scores(q_vec), q_vec, top_k)
+
+    def search_batch(self, q_mat: np.ndarray, top_k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        scores = self._codes.scores_batch(q_mat)
+        return [self._rerank(scores[:, j], q_mat[j], top_k) for j in range(q_mat.shape[0])]
+
+
+def build_index(embeds: np.ndarray) -> VectorIndex:
+    """
+    Factory: chooses the search index based on config.
+    """
+    if config.RETRIEVER_INDEX == "ivf" and embeds.shape[0] > 0:
+        return IVFIndex(embeds)
+    if config.RETRIEVER_INDEX == "quantized" and embeds.shape[0] > 0:
+        return QuantizedIndex(embeds)
+    return BruteForceIndex(embeds)
@@ -0,0 +1,90 @@
+# banking_bot/rag/ingest.py
+import os
+import threading
+from typing import Dict, List, Tuple
+from ..models import Snippet
+from .corpus_loader import policy_dir, iter_policy_files, iter_file_snippets, file_signature
+from .retriever import Retriever
+
+
+class CorpusIngestor:
+    """
+    Single-responsibility: keep a live Retriever in sync with the policy files.
+
+    sync() compares file signatures with the last run and re-chunks only the
+    files that were added, changed or removed; Retriever.replace_sources then
+    re-embeds only unseen chunks and swaps the new index in atomically.
+    """
+
+    def __init__(self, retriever: Retriever, directory: str | None = None) -> None:
+        self._retriever = retriever
+        self._dir = directory or policy_dir()
+        self._signatures: Dict[str, Tuple[int, int]] = self._scan()
+        self._lock = threading.Lock()
+        self._watcher: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        if not os.path.isdir(self._dir):
+            return {}
+        signatures: Dict[str, Tuple[int, int]] = {}
+        for path in iter_policy_files(self._dir):
+            try:
+                signatures[path] = file_signature(path)
+            except OSError:
+                continue  # removed while scanning
+        return signatures
+
+    def sync(self) -> Dict[str, List[str]]:
+        """
+        Apply file changes since the last sync. Returns the affected file names.
+        """
+        with self._lock:
+            current = self._scan()
+            added = [p for p in current if p not in self._signatures]
+            changed = [p for p in current if p in self._signatures and current[p] != self._signatures[p]]
+            removed = [p for p in self._signatures if p not in current]
+
+            changes: Dict[str, List[Snippet]] = {}
+            for path in added + changed:
+                try:
+                    changes[os.path.basename(path)] = list(iter_file_snippets(path))
+                except OSError as e:
+                    print("Corpus ingest error:", path, e)
+                    current.pop(path, None)
+            for path in removed:
+                changes[os.path.basename(path)] = []
+
+            if changes:
+                self._retriever.replace_sources(changes)
+            self._signatures = current
+
+            return {
+                "added": [os.path.basename(p) for p in added],
+                "changed": [os.path.basename(p) for p in changed],
+                "removed": [os.path.basename(p) for p in removed],
+            }
+
+    def start_watching(self, interval_s: float) -> None:
+        """
+        Poll the policy directory in a daemon thread and sync on changes.
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval_s,), name="corpus-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+
+    def _watch(self, interval_s: float) -> None:
+        while not self._stop.wait(interval_s):
+            try:
+                report = self.sync()
+                if any(report.values()):
+                    print("Corpus reindexed:", report)
+            except Exception as e:
+                print("Corpus watcher error:", e)
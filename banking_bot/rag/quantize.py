@@ -0,0 +1,118 @@
+# banking_bot/rag/quantize.py
+"""
+Compressed copies of the embedding matrix for the first search pass.
+
+- float16: half the memory of float32, near-lossless for cosine scores
+- int8: symmetric per-dimension scalar quantization, a quarter of float32
+- PCA (optional, before either): keeps the top principal components only
+
+Scores from these are approximate; QuantizedIndex rescores a shortlist
+against the full-precision rows.
+"""
+from __future__ import annotations
+from typing import Optional
+import numpy as np
+
+QUANT_DTYPES = ("float16", "int8")
+
+# rows decoded to float32 at a time while scoring (bounds temporary memory)
+_SCORE_CHUNK = 16384
+
+
+class PCAProjection:
+    """
+    Projection onto the top principal components of the corpus rows.
+
+    Rows are centred before projecting; queries are not, which shifts every
+    score of a query by the same constant and leaves the ranking unchanged.
+    """
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray) -> None:
+        self.mean = mean.astype(np.float32)
+        self.components = components.astype(np.float32)  # (dim, out_dim)
+
+    @classmethod
+    def fit(cls, x: np.ndarray, out_dim: int, sample_size: int = 20000, seed: int = 0) -> "PCAProjection":
+        n = x.shape[0]
+        rng = np.random.default_rng(seed)
+        rows = np.sort(rng.choice(n, min(n, sample_size), replace=False))
+        sample = np.asarray(x[rows], dtype=np.float32)
+        mean = sample.mean(axis=0)
+        cov = np.cov(sample - mean, rowvar=False)
+        _, vecs = np.linalg.eigh(cov)  # ascending eigenvalues
+        return cls(mean, vecs[:, ::-1][:, :out_dim])
+
+    @property
+    def out_dim(self) -> int:
+        return self.components.shape[1]
+
+    def rows(self, x: np.ndarray) -> np.ndarray:
+        return (np.asarray(x, dtype=np.float32) - self.mean) @ self.components
+
+    def queries(self, q: np.ndarray) -> np.ndarray:
+        return np.asarray(q, dtype=np.float32) @ self.components
+
+
+class QuantizedMatrix:
+    """
+    Single-responsibility: a compressed row matrix that answers approximate
+    inner products with query vectors.
+    """
+
+    def __init__(self, x: np.ndarray, dtype: str = "int8", pca_dim: int = 0, chunk: int = 65536) -> None:
+        if dtype not in QUANT_DTYPES:
+            raise ValueError(f"unknown quantization dtype: {dtype}")
+        self.dtype = dtype
+        n, dim = x.shape
+        self._pca: Optional[PCAProjection] = (
+            PCAProjection.fit(x, pca_dim) if 0 < pca_dim < dim and n > 1 else None
+        )
+        out_dim = self._pca.out_dim if self._pca is not None else dim
+
+        self._scale: Optional[np.ndarray] = None
+        if dtype == "int8":
+            # first pass: per-dimension range, so outliers in one column do not
+            # cost precision in the others
+            max_abs = np.zeros(out_dim, dtype=np.float32)
+            for start in range(0, n, chunk):
+                max_abs = np.maximum(max_abs, np.abs(self._project(x[start:start + chunk])).max(axis=0))
+            self._scale = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+
+        self._codes = np.empty((n, out_dim), dtype=np.int8 if dtype == "int8" else np.float16)
+        for start in range(0, n, chunk):
+            block = self._project(x[start:start + chunk])
+            if self._scale is not None:
+                block = np.clip(np.rint(block / self._scale), -127, 127)
+            self._codes[start:start + chunk] = block
+
+    def _project(self, block: np.ndarray) -> np.ndarray:
+        if self._pca is not None:
+            return self._pca.rows(block)
+        return np.asarray(block, dtype=np.float32)
+
+    @property
+    def nbytes(self) -> int:
+        total = self._codes.nbytes
+        if self._scale is not None:
+            total += self._scale.nbytes
+        if self._pca is not None:
+            total += self._pca.components.nbytes + self._pca.mean.nbytes
+        return total
+
+    def _prepare(self, q: np.ndarray) -> np.ndarray:
+        q = self._pca.queries(q) if self._pca is not None else np.asarray(q, dtype=np.float32)
+        # fold the int8 scale into the query instead of dequantizing the rows
+        return q * self._scale if self._scale is not None else q
+
+    def scores(self, q_vec: np.ndarray) -> np.ndarray:
+        """Approximate scores of every row, shape (n,)."""
+        return self.scores_batch(q_vec[None, :])[:, 0]
+
+    def scores_batch(self, q_mat: np.ndarray) -> np.ndarray:
+        """Approximate scores of every row for each query, shape (n, batch)."""
+        qs = self._prepare(q_mat).T
+        out = np.empty((self._codes.shape[0], qs.shape[1]), dtype=np.float32)
+        for start in range(0, self._codes.shape[0], _SCORE_CHUNK):
+            block = self._codes[start:start + _SCORE_CHUNK].astype(np.float32)
+            out[start:start + _SCORE_CHUNK] = block @ qs
+        return out
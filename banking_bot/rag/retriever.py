@@ -1,8 +1,36 @@
 # banking_bot/rag/retriever.py
-from typing import List
+import hashlib
+import threading
+from typing import Dict, List
 import numpy as np
 from ..models import Snippet
+from .. import config
 from .embeddings import EmbeddingProvider
+from .embedding_store import EmbeddingStore, content_hash
+from .index import VectorIndex, build_index, top_k_desc
+from .sparse import BM25Index
+
+
+class _CorpusState:
+    """
+    Immutable snapshot of the indexed corpus. Retriever swaps whole snapshots,
+    so a query always sees a consistent (snippets, embeds, index) triple.
+    """
+
+    def __init__(self, snippets: List[Snippet], embeds: np.ndarray, index: VectorIndex) -> None:
+        self.snippets = snippets
+        self.embeds = embeds
+        self.index = index
+        # the inverted index is built at ingest time, next to the dense vectors
+        self.sparse = (
+            BM25Index([s.text for s in snippets], k1=config.BM25_K1, b=config.BM25_B)
+            if config.RETRIEVAL_MODE == "hybrid"
+            else None
+        )
+        self.hashes = [content_hash(s.text) for s in snippets]
+        self.version = hashlib.sha256(
+            "".join(f"{s.id}:{h}\n" for s, h in zip(snippets, self.hashes)).encode("utf-8")
+        ).hexdigest()
 
 
 class Retriever:
@@ -10,26 +38,131 @@ class Retriever:
     Single-responsibility: given a query, return top-k relevant snippets using cosine similarity.
     """
 
-    def __init__(self, snippets: List[Snippet], embedder: EmbeddingProvider) -> None:
-        self._snippets = snippets
+    def __init__(
+        self,
+        snippets: List[Snippet],
+        embedder: EmbeddingProvider,
+        store: EmbeddingStore | None = None,
+        index: VectorIndex | None = None,
+    ) -> None:
         self._embedder = embedder
-        self._texts = [s.text for s in snippets]
-        self._ids = [s.id for s in snippets]
-        self._embeds = self._embedder.encode(self._texts)
+        self._store = store
+        self._update_lock = threading.Lock()
+        # the store only re-encodes chunks whose content hash it has not seen
+        embeds = (store or self._embedder).encode([s.text for s in snippets])
+        self._state = _CorpusState(snippets, embeds, index or build_index(embeds))
+
+    @property
+    def version(self) -> str:
+        """Fingerprint of the indexed corpus; changes whenever a chunk changes."""
+        return self._state.version
+
+    @property
+    def embedder(self) -> EmbeddingProvider:
+        return self._embedder
+
+    @property
+    def snippets(self) -> List[Snippet]:
+        return self._state.snippets
 
     def retrieve(self, query: str, top_k: int = 3) -> List[Snippet]:
-        q_vec = self._embedder.encode([query])[0]
-        scores = self._embeds @ q_vec
-        idx = np.argsort(-scores)[:top_k]
+        return self.search(self.embed_query(query), top_k=top_k, query=query)
+
+    def embed_query(self, query: str) -> np.ndarray:
+        return self._embedder.encode_query(query)
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        return self._embedder.encode_queries(queries)
+
+    def search(self, q_vec: np.ndarray, top_k: int = 3, query: str | None = None) -> List[Snippet]:
+        """
+        Dense search over the index; in hybrid mode (and when the query text is
+        given) BM25 shortlists candidates that are then fused with dense scores.
+        """
+        state = self._state
+        idx = None
+        if state.sparse is not None and query:
+            idx, scores = self._hybrid_search(state, q_vec, query, top_k)
+        if idx is None:
+            idx, scores = state.index.search(q_vec, top_k)
+        return self._to_snippets(state, idx, scores)
+
+    def search_many(self, q_mat: np.ndarray, queries: List[str], top_k: int = 3) -> List[List[Snippet]]:
+        """
+        search() for a batch of query vectors. Dense-only lookups are scored
+        against the corpus with one matrix multiply.
+        """
+        state = self._state
+        if state.sparse is not None:
+            return [self.search(q, top_k=top_k, query=text) for q, text in zip(q_mat, queries)]
+        return [
+            self._to_snippets(state, idx, scores)
+            for idx, scores in state.index.search_batch(q_mat, top_k)
+        ]
+
+    @staticmethod
+    def _to_snippets(state: _CorpusState, idx: np.ndarray, scores: np.ndarray) -> List[Snippet]:
         results: List[Snippet] = []
-        for i in idx:
-            s = self._snippets[i]
+        for i, score in zip(idx, scores):
+            s = state.snippets[i]
             results.append(
                 Snippet(
                     id=s.id,
                     text=s.text,
-                    score=float(scores[i]),
+                    score=float(score),
                     source=s.source,
                 )
             )
         return results
+
+    @staticmethod
+    def _hybrid_search(state: _CorpusState, q_vec: np.ndarray, query: str, top_k: int):
+        cand, bm25 = state.sparse.search(query, config.SPARSE_CANDIDATES)
+        if cand.shape[0] < top_k:
+            return None, None  # too few lexical matches: fall back to dense
+
+        order = np.argsort(cand)  # ascending rows read the (memory-mapped) matrix sequentially
+        cand, bm25 = cand[order], bm25[order]
+        dense = np.asarray(state.embeds[cand] @ q_vec)
+        fused = (
+            config.HYBRID_DENSE_WEIGHT * dense
+            + config.HYBRID_SPARSE_WEIGHT * bm25 / (float(bm25.max()) or 1.0)
+        )
+        best, best_scores = top_k_desc(fused, top_k)
+        return cand[best], best_scores
+
+    def replace_sources(self, changes: Dict[str, List[Snippet]]) -> None:
+        """
+        Incrementally update the corpus. `changes` maps a source (file name)
+        to its complete new list of snippets; an empty list removes the source.
+        Only chunks with unseen content are encoded; the new snapshot is built
+        off to the side and swapped in atomically, so in-flight queries are
+        never blocked.
+        """
+        with self._update_lock:
+            old = self._state
+            snippets = [s for s in old.snippets if s.source not in changes]
+            for new_snippets in changes.values():
+                snippets.extend(new_snippets)
+            texts = [s.text for s in snippets]
+
+            if self._store is not None:
+                embeds = self._store.encode(texts)
+            else:
+                embeds = self._encode_reusing(texts, old)
+            self._state = _CorpusState(snippets, embeds, build_index(embeds))
+
+    def _encode_reusing(self, texts: List[str], old: _CorpusState) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, old.embeds.shape[-1]), dtype=np.float32)
+        row_of = {h: i for i, h in enumerate(old.hashes)}
+        hashes = [content_hash(t) for t in texts]
+        missing = [i for i, h in enumerate(hashes) if h not in row_of]
+
+        new_vecs = self._embedder.encode([texts[i] for i in missing]) if missing else None
+        dim = old.embeds.shape[1] if old.embeds.ndim == 2 and old.embeds.shape[0] else new_vecs.shape[1]
+        out = np.empty((len(texts), dim), dtype=np.float32)
+        new_row = {i: j for j, i in enumerate(missing)}
+        for i, h in enumerate(hashes):
+            out[i] = new_vecs[new_row[i]] if i in new_row else old.embeds[row_of[h]]
+        return out
@@ -0,0 +1,87 @@
+# banking_bot/rag/sparse.py
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+import numpy as np
+from .index import top_k_desc
+
+# keeps regulatory terms together: "e-kyc", "3.1", "form-60", "ckyc"
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-./][a-z0-9]+)*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from how i in is it my of on or "
+    "the to what when where which who why will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased terms; compound terms are indexed both whole and by part
+    ("e-kyc" → "e-kyc", "e", "kyc").
+    """
+    terms: List[str] = []
+    for tok in _TOKEN_RE.findall(text.lower()):
+        if tok in _STOPWORDS:
+            continue
+        terms.append(tok)
+        if not tok.isalnum():
+            terms.extend(p for p in re.split(r"[-./]", tok) if p and p not in _STOPWORDS)
+    return terms
+
+
+class BM25Index:
+    """
+    Single-responsibility: sparse keyword retrieval with an inverted index.
+
+    Postings are stored per term as (row ids, term frequencies) arrays, so a
+    query only touches the postings of its own terms, never the whole corpus.
+    """
+
+    def __init__(self, texts: List[str], k1: float = 1.5, b: float = 0.75) -> None:
+        self._k1 = k1
+        self._b = b
+        self._n = len(texts)
+
+        doc_len = np.zeros(self._n, dtype=np.float32)
+        ids_of: Dict[str, List[int]] = {}
+        tfs_of: Dict[str, List[int]] = {}
+        for row, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            doc_len[row] = sum(counts.values())
+            for term, tf in counts.items():
+                ids_of.setdefault(term, []).append(row)
+                tfs_of.setdefault(term, []).append(tf)
+
+        avgdl = float(doc_len.mean()) if self._n else 0.0
+        # per-row length normalisation, precomputed once
+        self._norm = k1 * (1 - b + b * doc_len / (avgdl or 1.0))
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+            term: (np.asarray(ids, dtype=np.int64), np.asarray(tfs_of[term], dtype=np.float32))
+            for term, ids in ids_of.items()
+        }
+        self._idf: Dict[str, float] = {
+            term: math.log(1 + (self._n - len(ids) + 0.5) / (len(ids) + 0.5))
+            for term, ids in ids_of.items()
+        }
+
+    def search(self, query: str, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (row ids, BM25 scores) of the best matches, best first.
+        """
+        ids_parts: List[np.ndarray] = []
+        score_parts: List[np.ndarray] = []
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            ids, tfs = posting
+            ids_parts.append(ids)
+            score_parts.append(self._idf[term] * tfs * (self._k1 + 1) / (tfs + self._norm[ids]))
+
+        if not ids_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        rows, inverse = np.unique(np.concatenate(ids_parts), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(score_parts)).astype(np.float32)
+        best, best_scores = top_k_desc(scores, top_k)
+        return rows[best], best_scores
@@ -2,6 +2,7 @@
 from typing import Dict
 from ..models import SafetyResult
 from .. import config
+from ..matcher import KeywordMatcher, get_keyword_matcher
 
 
 class SafetyFilter:
@@ -9,30 +10,33 @@ class SafetyFilter:
     Single-responsibility: classify a message as allowed / risky / sensitive.
     """
 
-    def __init__(self) -> None:
-        self._risky_keywords = config.RISKY_KEYWORDS
-        self._sensitive_keywords = config.SENSITIVE_KEYWORDS
+    def __init__(self, matcher: KeywordMatcher | None = None) -> None:
+        self._matcher = matcher or get_keyword_matcher()
 
     def check(self, text: str) -> SafetyResult:
         t = text.lower()
         flags: Dict[str, bool] = {"risky": False, "sensitive": False}
+        # one pass finds safety and intent keywords; callers can reuse the hits
+        hits = self._matcher.find(t)
 
-        if any(k in t for k in self._risky_keywords):
+        if hits.get("risky"):
             flags["risky"] = True
             return SafetyResult(
                 allowed=False,
                 category="risky",
                 message=config.REFUSAL_MSG_RISKY,
                 flags=flags,
+                keyword_hits=hits,
             )
 
-        if any(k in t for k in self._sensitive_keywords):
+        if hits.get("sensitive"):
             flags["sensitive"] = True
             return SafetyResult(
                 allowed=False,
                 category="sensitive",
                 message=config.REFUSAL_MSG_SENSITIVE,
                 flags=flags,
+                keyword_hits=hits,
             )
 
         return SafetyResult(
@@ -40,4 +44,5 @@ class SafetyFilter:
             category="allowed",
             message=None,
             flags=flags,
+            keyword_hits=hits,
         )
@@ -0,0 +1,8 @@
+# bench/__init__.py
+"""
+Load-testing and benchmark harness (not imported by the app).
+
+- fake_ollama: local Ollama stand-in with configurable latency and token rate
+- replay: replays chatlogs.jsonl against ChatOrchestrator or the Flask app
+- compare: diffs two result files and flags regressions
+"""
@@ -0,0 +1,56 @@
+# bench/compare.py
+"""
+Compare two bench.replay result files.
+
+    python -m bench.compare bench/results/old.json bench/results/new.json --tolerance 0.10
+
+Exits with status 1 when throughput drops or a p95/p99 latency (end-to-end or
+per stage) grows by more than the tolerance.
+"""
+import argparse
+import json
+import sys
+from typing import List
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative change")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        cand = json.load(f)
+
+    regressions: List[str] = []
+
+    def check(name: str, old: float | None, new: float | None, higher_is_better: bool = False) -> None:
+        if not old or new is None:
+            return
+        change = (new - old) / old
+        worse = change < -args.tolerance if higher_is_better else change > args.tolerance
+        flag = "  REGRESSION" if worse else ""
+        print(f"{name:32s} {old:>10.3f} -> {new:>10.3f} ({change:+.1%}){flag}")
+        if worse:
+            regressions.append(name)
+
+    print(f"baseline {base.get('commit')}  candidate {cand.get('commit')}")
+    check("throughput_rps", base.get("throughput_rps"), cand.get("throughput_rps"), higher_is_better=True)
+    for q in ("p95", "p99"):
+        check(f"latency_ms.{q}", base["latency_ms"].get(q), cand["latency_ms"].get(q))
+    for stage, stats in base.get("stages_ms", {}).items():
+        new_stats = cand.get("stages_ms", {}).get(stage, {})
+        for q in ("p95", "p99"):
+            check(f"{stage}.{q}", stats.get(q), new_stats.get(q))
+    check("peak_rss_mb", base.get("peak_rss_mb"), cand.get("peak_rss_mb"))
+
+    if regressions:
+        print(f"{len(regressions)} regression(s):", ", ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
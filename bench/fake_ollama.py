@@ -0,0 +1,97 @@
+# bench/fake_ollama.py
+"""
+Fake Ollama /api/generate server for benchmarks.
+
+    python -m bench.fake_ollama --port 11435 --latency-ms 300 --tokens-per-s 40
+
+Non-streaming requests sleep latency + tokens / rate and return one JSON
+object; streaming requests send NDJSON lines at the configured token rate.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+WORDS = ("Please", "use", "the", "official", "mobile", "banking", "app", "or", "call", "the", "helpline.")
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, addr: Tuple[str, int], latency_ms: float, tokens_per_s: float, tokens: int) -> None:
+        super().__init__(addr, _Handler)
+        self.latency_s = latency_ms / 1000.0
+        self.token_s = 1.0 / tokens_per_s if tokens_per_s > 0 else 0.0
+        self.tokens = tokens
+        self.requests = 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeOllamaServer
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        srv = self.server
+        srv.requests += 1
+        words = [(" " if i else "") + WORDS[i % len(WORDS)] for i in range(srv.tokens)]
+        context = list(body.get("context") or []) + list(range(len(body.get("prompt", "")) // 4 + srv.tokens))
+
+        if body.get("stream", True):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            time.sleep(srv.latency_s)
+            for w in words:
+                self._chunk({"response": w, "done": False})
+                time.sleep(srv.token_s)
+            self._chunk({"response": "", "done": True, "context": context})
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            time.sleep(srv.latency_s + srv.token_s * srv.tokens)
+            data = json.dumps({"response": "".join(words), "done": True, "context": context}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    def _chunk(self, obj) -> None:
+        data = (json.dumps(obj) + "\n").encode()
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+def start_fake_ollama(
+    port: int = 0, latency_ms: float = 300.0, tokens_per_s: float = 40.0, tokens: int = 32
+) -> FakeOllamaServer:
+    """
+    Start a server in a daemon thread; port 0 picks a free port
+    (see server.server_address).
+    """
+    server = FakeOllamaServer(("127.0.0.1", port), latency_ms, tokens_per_s, tokens)
+    threading.Thread(target=server.serve_forever, name="fake-ollama", daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="delay before the first token")
+    parser.add_argument("--tokens-per-s", type=float, default=40.0)
+    parser.add_argument("--tokens", type=int, default=32, help="tokens per answer")
+    args = parser.parse_args()
+    server = FakeOllamaServer(("127.0.0.1", args.port), args.latency_ms, args.tokens_per_s, args.tokens)
+    print(f"Fake Ollama on http://127.0.0.1:{args.port}/api/generate")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# bench/quant_report.py
+"""
+Recall@k versus resident memory for the quantized retrieval index settings,
+to choose QUANT_DTYPE / QUANT_PCA_DIM / QUANT_RESCORE.
+
+    python -m bench.quant_report                          # policy corpus
+    python -m bench.quant_report --synthetic 200000 --k 10
+    python -m bench.quant_report --pca 192,96 --rescore 20,50
+
+Recall is measured against exact float32 search (BruteForceIndex) for every
+dtype x PCA x rescore combination. Queries come from chatlogs.jsonl when it
+exists, otherwise corpus rows with added noise are used.
+"""
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from banking_bot.rag.index import BruteForceIndex, QuantizedIndex
+from banking_bot.rag.quantize import QUANT_DTYPES
+from .replay import load_messages
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    return (x / (np.linalg.norm(x, axis=1, keepdims=True) + 1e-9)).astype(np.float32)
+
+
+def synthetic_corpus(n: int, dim: int, n_queries: int, seed: int):
+    # clustered unit vectors, closer to sentence embeddings than uniform noise
+    rng = np.random.default_rng(seed)
+    centers = _normalize(rng.standard_normal((max(1, n // 200), dim)))
+    rows = centers[rng.integers(0, centers.shape[0], n)] + 1.4 * rng.standard_normal((n, dim)) / np.sqrt(dim)
+    rows = _normalize(rows)
+    queries = _normalize(rows[rng.integers(0, n, n_queries)] + 0.1 * rng.standard_normal((n_queries, dim)))
+    return rows, queries
+
+
+def policy_corpus(chatlogs: str, n_queries: int, seed: int):
+    from banking_bot import config
+    from banking_bot.rag import EmbeddingProvider, EmbeddingStore, load_policy_snippets
+
+    embedder = EmbeddingProvider()
+    snippets = load_policy_snippets()
+    store = EmbeddingStore(embedder) if config.USE_EMBED_CACHE else None
+    rows = np.asarray((store or embedder).encode([s.text for s in snippets]), dtype=np.float32)
+
+    msgs = load_messages(chatlogs) if os.path.exists(chatlogs) else []
+    if msgs:
+        queries = embedder.encode(list(dict.fromkeys(msgs))[:n_queries])
+    else:
+        rng = np.random.default_rng(seed)
+        picked = rows[rng.integers(0, rows.shape[0], n_queries)]
+        queries = _normalize(picked + 0.4 * rng.standard_normal(picked.shape) / np.sqrt(rows.shape[1]))
+    return rows, np.asarray(queries, dtype=np.float32)
+
+
+def recall_at_k(found: List[np.ndarray], exact: List[np.ndarray], k: int) -> float:
+    return float(np.mean([len(set(f[:k].tolist()) & set(e[:k].tolist())) / k for f, e in zip(found, exact)]))
+
+
+def evaluate(rows: np.ndarray, queries: np.ndarray, k: int, pca_dims: List[int], rescores: List[int]) -> List[Dict[str, Any]]:
+    k = min(k, rows.shape[0])
+    exact = [idx for idx, _ in BruteForceIndex(rows).search_batch(queries, k)]
+    baseline_bytes = rows.shape[0] * rows.shape[1] * 4
+    report: List[Dict[str, Any]] = [{
+        "setting": "float32 (exact)",
+        "resident_bytes": baseline_bytes,
+        "bytes_per_vector": rows.shape[1] * 4,
+        f"recall@{k}": 1.0,
+        "query_ms": None,
+    }]
+
+    for dtype in QUANT_DTYPES:
+        for pca_dim in [0] + [d for d in pca_dims if 0 < d < rows.shape[1]]:
+            started = time.perf_counter()
+            index = QuantizedIndex(rows, dtype=dtype, pca_dim=pca_dim, rescore=0)
+            build_s = time.perf_counter() - started
+            for rescore in rescores:
+                index.rescore = rescore
+                started = time.perf_counter()
+                found = [index.search(q, k)[0] for q in queries]
+                query_ms = (time.perf_counter() - started) * 1000 / len(queries)
+                name = dtype + (f" + pca{pca_dim}" if pca_dim else "") + (f", rescore {rescore}" if rescore else "")
+                report.append({
+                    "setting": name,
+                    "resident_bytes": index.nbytes,
+                    "bytes_per_vector": round(index.nbytes / rows.shape[0], 1),
+                    f"recall@{k}": round(recall_at_k(found, exact, k), 4),
+                    "query_ms": round(query_ms, 3),
+                    "build_s": round(build_s, 2),
+                })
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=0, help="use N synthetic vectors instead of the corpus")
+    parser.add_argument("--dim", type=int, default=384, help="dimension of synthetic vectors")
+    parser.add_argument("--chatlogs", default="chatlogs.jsonl")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--pca", default="192,96", help="comma-separated PCA dimensions to try")
+    parser.add_argument("--rescore", default="0,20,50", help="comma-separated shortlist sizes to try")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        rows, queries = synthetic_corpus(args.synthetic, args.dim, args.queries, args.seed)
+    else:
+        rows, queries = policy_corpus(args.chatlogs, args.queries, args.seed)
+    pca_dims = [int(d) for d in args.pca.split(",") if d.strip()]
+    rescores = [int(r) for r in args.rescore.split(",") if r.strip()]
+
+    report = evaluate(rows, queries, args.k, pca_dims, rescores)
+    print(f"{rows.shape[0]} vectors x {rows.shape[1]} dims, {queries.shape[0]} queries")
+    recall_key = next(key for key in report[0] if key.startswith("recall@"))
+    print(f"{'setting':<32}{'MB':>10}{'B/vec':>9}{recall_key:>11}{'ms/query':>10}")
+    for row in report:
+        ms = "" if row["query_ms"] is None else f"{row['query_ms']:.3f}"
+        print(
+            f"{row['setting']:<32}{row['resident_bytes'] / 2**20:>10.2f}"
+            f"{row['bytes_per_vector']:>9}{row[recall_key]:>11.4f}{ms:>10}"
+        )
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"vectors": rows.shape[0], "dim": rows.shape[1], "k": args.k, "report": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
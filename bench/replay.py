@@ -0,0 +1,246 @@
+# bench/replay.py
+"""
+Replay chat traffic and report throughput, latency percentiles per stage and
+peak RSS.
+
+    python -m bench.replay --target orchestrator --concurrency 16 --requests 2000
+    python -m bench.replay --target flask --stream --fake-latency-ms 200
+    python -m bench.replay --target http --url http://localhost:8501
+
+Messages come from chatlogs.jsonl (replayed in order, cycling) or, with
+--synthetic, are sampled from it with small variations. The orchestrator and
+flask targets run in-process against a local fake Ollama server; per-stage
+timings are read from InteractionLog.extra["timings_ms"]. Results are written
+as JSON (default bench/results/<time>-<commit>.json) for bench.compare.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from banking_bot import config
+from banking_bot.logging import InteractionLogger
+from banking_bot.models import InteractionLog
+from .fake_ollama import start_fake_ollama
+
+
+class _CapturingLogger(InteractionLogger):
+    """Keeps stage timings in memory instead of writing chatlogs."""
+
+    def __init__(self) -> None:
+        super().__init__(path=os.devnull, async_mode=False)
+        self.timings: List[Dict[str, float]] = []
+        self._capture_lock = threading.Lock()
+
+    def log(self, entry: InteractionLog) -> None:
+        with self._capture_lock:
+            self.timings.append(dict((entry.extra or {}).get("timings_ms", {})))
+
+
+def load_messages(path: str) -> List[str]:
+    msgs: List[str] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            msg = json.loads(line).get("user_msg")
+            if msg:
+                msgs.append(msg)
+    return msgs
+
+
+def build_workload(msgs: List[str], n: int, synthetic: bool, seed: int) -> List[str]:
+    if not synthetic:
+        return [msgs[i % len(msgs)] for i in range(n)]
+    rng = random.Random(seed)
+    variants = (str.lower, str.upper, str.capitalize, lambda m: m + "?", lambda m: "please, " + m, lambda m: m)
+    return [rng.choice(variants)(rng.choice(msgs)) for _ in range(n)]
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    arr = np.asarray(values, dtype=np.float64)
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        "count": int(arr.size),
+        "mean": round(float(arr.mean()), 3),
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(arr.max()), 3),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def make_sender(args, logger: _CapturingLogger | None) -> Callable[[str], None]:
+    if args.target == "http":
+        import requests
+
+        local = threading.local()
+        path = "/api/chat/stream" if args.stream else "/api/chat"
+
+        def send(msg: str) -> None:
+            session = getattr(local, "session", None)
+            if session is None:
+                session = local.session = requests.Session()
+            r = session.post(args.url.rstrip("/") + path, json={"message": msg, "history": []}, timeout=120)
+            r.raise_for_status()
+            _ = r.content
+        return send
+
+    from banking_bot.core import build_orchestrator
+
+    orchestrator = build_orchestrator(logger=logger)
+
+    if args.target == "orchestrator":
+        def send(msg: str) -> None:
+            if args.stream:
+                for _ in orchestrator.handle_message_stream(msg, []):
+                    pass
+            else:
+                orchestrator.handle_message(msg, [])
+        return send
+
+    import app as app_module
+
+    app_module._orchestrator = orchestrator
+    local = threading.local()
+    path = "/api/chat/stream" if args.stream else "/api/chat"
+
+    def send(msg: str) -> None:
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app_module.app.test_client()
+        r = client.post(path, json={"message": msg, "history": []})
+        if r.status_code != 200:
+            raise RuntimeError(f"HTTP {r.status_code}")
+        _ = r.data
+    return send
+
+
+def run(args) -> Dict[str, Any]:
+    msgs = load_messages(args.chatlogs)
+    if not msgs:
+        sys.exit(f"no user messages found in {args.chatlogs}")
+    workload = build_workload(msgs, args.requests, args.synthetic, args.seed)
+
+    server = None
+    logger = None
+    if args.target != "http":
+        server = start_fake_ollama(0, args.fake_latency_ms, args.fake_tokens_per_s, args.fake_tokens)
+        config.USE_OLLAMA = True
+        config.OLLAMA_URL = f"http://127.0.0.1:{server.server_address[1]}/api/generate"
+        config.ANSWER_CACHE_ENABLED = not args.no_answer_cache
+        logger = _CapturingLogger()
+
+    send = make_sender(args, logger)
+    for msg in workload[: args.warmup]:
+        send(msg)
+    if logger is not None:
+        logger.timings.clear()
+
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(msg: str) -> None:
+        nonlocal errors
+        t = time.perf_counter()
+        try:
+            send(msg)
+        except Exception as e:
+            with lock:
+                errors += 1
+            if errors <= 5:
+                print("request failed:", e)
+            return
+        with lock:
+            latencies.append((time.perf_counter() - t) * 1000)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(one, workload))
+    wall_s = time.perf_counter() - started
+
+    stages: Dict[str, List[float]] = {}
+    for timings in (logger.timings if logger is not None else []):
+        for stage, ms in timings.items():
+            stages.setdefault(stage, []).append(ms)
+
+    if server is not None:
+        server.shutdown()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "params": {
+            k: getattr(args, k)
+            for k in ("target", "stream", "concurrency", "requests", "synthetic",
+                      "fake_latency_ms", "fake_tokens_per_s", "fake_tokens", "no_answer_cache")
+        },
+        "throughput_rps": round(len(latencies) / wall_s, 3) if wall_s else 0.0,
+        "wall_s": round(wall_s, 3),
+        "errors": errors,
+        "latency_ms": percentiles(latencies),
+        "stages_ms": {stage: percentiles(values) for stage, values in sorted(stages.items())},
+        # ru_maxrss is KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("orchestrator", "flask", "http"), default="orchestrator")
+    parser.add_argument("--url", default="http://localhost:8501", help="base URL for --target http")
+    parser.add_argument("--stream", action="store_true", help="use the streaming path")
+    parser.add_argument("--chatlogs", default="chatlogs.jsonl")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5, help="requests sent before measuring")
+    parser.add_argument("--synthetic", action="store_true", help="sample messages with variations")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fake-latency-ms", type=float, default=300.0)
+    parser.add_argument("--fake-tokens-per-s", type=float, default=40.0)
+    parser.add_argument("--fake-tokens", type=int, default=32)
+    parser.add_argument("--no-answer-cache", action="store_true")
+    parser.add_argument("--out", help="result file (default bench/results/<time>-<commit>.json)")
+    args = parser.parse_args()
+
+    result = run(args)
+    out = args.out or os.path.join(
+        "bench", "results", f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{result['commit']}.json"
+    )
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+    lat = result["latency_ms"]
+    print(f"{result['throughput_rps']} req/s, errors={result['errors']}, peak RSS {result['peak_rss_mb']} MB")
+    print(f"end-to-end ms: p50={lat.get('p50')} p95={lat.get('p95')} p99={lat.get('p99')}")
+    for stage, p in result["stages_ms"].items():
+        print(f"  {stage:16s} p50={p['p50']:>9} p95={p['p95']:>9} p99={p['p99']:>9}")
+    print("results written to", out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# gunicorn.conf.py
+# Loads the embedding model and retriever index once in the master process;
+# forked workers share those pages copy-on-write instead of each loading them.
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8501')}"
+# Conversation sessions live in each worker's memory. The chat page also sends
+# its history, so any worker can answer; API clients that send only a
+# session_id need a session's requests routed to the same worker (sticky load
+# balancing) or a single worker scaled with threads.
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+timeout = 120
+preload_app = True
+
+# /admin/reindex only updates the worker that serves it: every worker polls
+# data/policies instead, so a new circular reaches all of them (unless
+# config.CORPUS_WATCH_INTERVAL_S is set explicitly; 0 here disables polling).
+_corpus_watch_interval_s = float(os.environ.get("CORPUS_WATCH_INTERVAL_S", "30"))
+
+# torch/OpenMP thread pools do not survive fork(): the master runs any
+# inference (building the index or intent centroids on a cold cache) on one
+# thread, and each worker gets its share of the cores after the fork.
+_torch_threads = None
+
+
+def on_starting(server):
+    global _torch_threads
+    try:
+        import torch
+
+        _torch_threads = torch.get_num_threads()
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+
+    import app
+
+    # load weights and index before fork, but run nothing through the model
+    # and leave LLM connections to the workers
+    app.get_orchestrator().preload()
+    server.log.info("Pipeline loaded in master")
+    # keep the shared heap out of the cyclic GC so collections in the workers
+    # do not touch (and copy) those pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    if _torch_threads is not None:
+        import torch
+
+        torch.set_num_threads(max(1, _torch_threads // workers))
+
+    import app
+    from banking_bot import config
+
+    if config.CORPUS_WATCH_INTERVAL_S <= 0:
+        config.CORPUS_WATCH_INTERVAL_S = _corpus_watch_interval_s
+    app.after_fork()
+    timings = app.get_orchestrator().warmup(include_llm=False)
+    server.log.info("Worker %s warmed up: %s", worker.pid, timings)
@@ -0,0 +1,109 @@
+# tests/test_admission.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("sentence_transformers")  # banking_bot.core pulls in the embedder
+
+from banking_bot.core.admission import AdmissionController, Overloaded
+from banking_bot.metrics import MetricsRegistry
+
+
+def _controller(max_concurrent: int = 1, max_queue: int = 4, service_s: float = 0.0) -> AdmissionController:
+    controller = AdmissionController(max_concurrent, max_queue, metrics=MetricsRegistry())
+    if service_s:
+        # one slot held for service_s seeds the service time estimate
+        controller.acquire()
+        controller.release(service_s)
+    return controller
+
+
+def _wait_for(predicate, timeout_s: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_admits_immediately_while_slots_are_free():
+    controller = _controller(max_concurrent=2)
+    assert controller.acquire() == 0.0
+    assert controller.acquire() == 0.0
+    assert controller.stats()["in_flight"] == 2
+    controller.release()
+    controller.release()
+    assert controller.stats()["in_flight"] == 0
+
+
+def test_queued_callers_get_the_slot_in_fifo_order():
+    controller = _controller()
+    controller.acquire()
+    order = []
+
+    def worker(n: int) -> None:
+        controller.acquire()
+        order.append(n)
+        controller.release()
+
+    threads = []
+    for n in range(3):
+        thread = threading.Thread(target=worker, args=(n,))
+        thread.start()
+        threads.append(thread)
+        _wait_for(lambda: controller.stats()["queued"] == n + 1)
+
+    controller.release()  # handed straight to the first waiter
+    for thread in threads:
+        thread.join(2.0)
+    assert order == [0, 1, 2]
+    assert controller.stats()["in_flight"] == 0 and controller.stats()["queued"] == 0
+
+
+def test_sheds_when_queue_is_full():
+    controller = _controller(max_queue=0, service_s=4.0)
+    controller.acquire()
+    with pytest.raises(Overloaded) as shed:
+        controller.acquire()
+    assert shed.value.reason == "queue_full"
+    assert shed.value.retry_after_s == 4  # one service time for the caller ahead
+
+
+def test_sheds_when_deadline_cannot_be_met():
+    controller = _controller(service_s=4.0)
+    controller.acquire()
+    with pytest.raises(Overloaded) as shed:
+        controller.acquire(deadline=time.perf_counter() + 1.0)
+    assert shed.value.reason == "deadline"
+    assert shed.value.retry_after_s == 4
+    assert controller.stats()["queued"] == 0
+
+
+def test_times_out_while_queued_without_leaking_the_slot():
+    controller = _controller()
+    controller.acquire()
+    with pytest.raises(Overloaded) as shed:
+        controller.acquire(deadline=time.perf_counter() + 0.05)
+    assert shed.value.reason == "timeout"
+    assert controller.stats()["queued"] == 0
+    controller.release()
+    assert controller.stats()["in_flight"] == 0
+
+
+def test_cancelled_async_waiter_returns_a_granted_slot():
+    controller = _controller()
+
+    async def scenario() -> None:
+        controller.acquire()
+        waiter = asyncio.ensure_future(controller.acquire_async())
+        while controller.stats()["queued"] == 0:
+            await asyncio.sleep(0)
+        controller.release()  # grants the slot to the waiter...
+        waiter.cancel()  # ...which goes away before it runs again
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(scenario())
+    assert controller.stats()["in_flight"] == 0
+    assert controller.acquire() == 0.0
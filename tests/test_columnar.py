@@ -0,0 +1,70 @@
+# tests/test_columnar.py
+import json
+
+import numpy as np
+
+from banking_bot.logging.analytics import aggregate, parse_time
+from banking_bot.logging.columnar import compact_logs, list_segments
+
+
+def _record(minute: int, **overrides):
+    record = {
+        "id": f"r{minute}",
+        "timestamp": f"2025-11-07T07:{minute:02d}:00+00:00",
+        "intent": "card_block",
+        "model": "llama3.2:3b",
+        "latency_ms": 100 * (minute + 1),
+        "risk_flag": False,
+        "sensitive_flag": False,
+        "guardrail_triggered": None,
+        "extra": {"cache_hit": minute % 2 == 0, "timings_ms": {"embed": 5.0, "llm": 80.0}},
+    }
+    record.update(overrides)
+    return record
+
+
+def _write(path, lines):
+    with open(path, "a", encoding="utf-8") as f:
+        for line in lines:
+            f.write((line if isinstance(line, str) else json.dumps(line)) + "\n")
+
+
+def test_malformed_lines_are_skipped_without_misaligning_columns(tmp_path):
+    log, segments = tmp_path / "chatlogs.jsonl", tmp_path / "segments"
+    _write(log, [
+        _record(0),
+        _record(1, extra="oops"),  # fails after the timestamp was parsed
+        _record(2, intent=["not", "a", "string"]),
+        "not json",
+        _record(3, guardrail_triggered="sensitive", sensitive_flag=True, extra=None),
+        _record(4),
+    ])
+
+    report = compact_logs(str(log), str(segments))
+    assert report["rows"] == 3 and report["skipped_lines"] == 3
+
+    (seg,) = list_segments(str(segments))
+    for name in seg.meta["columns"]:
+        assert seg.column(name).shape == (3,), name
+    assert np.isnan(seg.column("stage_llm")[1])  # the record without timings
+
+    stats = aggregate(str(segments))
+    assert stats["records"] == 3
+    assert stats["latency_ms"]["mean"] == 333.33  # 100, 400, 500
+    assert stats["guardrails"] == {"sensitive": 1}
+    assert stats["answer_cache_hit_rate"] == 1.0
+    assert stats["top_intents"] == {"card_block": 3}
+
+    window = aggregate(str(segments), parse_time("2025-11-07T07:03:00"), parse_time("2025-11-07T07:10:00"))
+    assert window["records"] == 2 and window["latency_ms"]["mean"] == 450.0
+
+
+def test_compaction_resumes_after_last_segment(tmp_path):
+    log, segments = tmp_path / "chatlogs.jsonl", tmp_path / "segments"
+    _write(log, [_record(0), _record(1)])
+    assert compact_logs(str(log), str(segments))["rows"] == 2
+    assert compact_logs(str(log), str(segments))["rows"] == 0
+
+    _write(log, [_record(2, extra=[]), _record(3)])
+    assert compact_logs(str(log), str(segments))["rows"] == 2
+    assert aggregate(str(segments))["records"] == 4
@@ -0,0 +1,96 @@
+# tests/test_fast_path.py
+import os
+
+import pytest
+
+pytest.importorskip("sentence_transformers")  # banking_bot.core pulls in the embedder
+
+from banking_bot import config
+from banking_bot.core import build_orchestrator
+from banking_bot.core import orchestrator as orchestrator_module
+from banking_bot.core.fast_path import FastPathResponder
+from banking_bot.llm import LLMProvider
+from banking_bot.logging import InteractionLogger
+from banking_bot.models import Snippet
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEMPLATES = {"card_block": "{snippet} Call us."}
+SOURCES = {"card_block": ["builtin_card_block", "*card*"]}
+
+
+def _responder() -> FastPathResponder:
+    return FastPathResponder(TEMPLATES, min_intent_score=0.6, min_retrieval_score=0.5, sources=SOURCES)
+
+
+def _snippet(source: str | None, score: float = 0.9) -> Snippet:
+    return Snippet(id="s1", text="Block the card in the app. ", score=score, source=source)
+
+
+@pytest.mark.parametrize("source", ["builtin_card_block", "debit_card_faq.txt"])
+def test_answers_from_matching_source(source):
+    answer, decision = _responder().answer("card_block", 0.9, [_snippet(source)])
+    assert answer == "Block the card in the app. Call us."
+    assert decision["used"] and decision["source"] == source
+
+
+@pytest.mark.parametrize("source", ["rbi_kyc_master_direction.txt", None])
+def test_skips_snippet_from_other_source(source):
+    answer, decision = _responder().answer("card_block", 0.9, [_snippet(source)])
+    assert answer is None
+    assert not decision["used"] and decision["reason"] == "source"
+
+
+def test_skips_intent_without_sources():
+    responder = FastPathResponder(TEMPLATES, min_intent_score=0.6, min_retrieval_score=0.5, sources={})
+    answer, decision = responder.answer("card_block", 0.9, [_snippet("builtin_card_block")])
+    assert answer is None and decision["reason"] == "source"
+
+
+def test_skips_low_intent_score():
+    answer, decision = _responder().answer("card_block", 0.3, [_snippet("builtin_card_block")])
+    assert answer is None and decision["reason"] == "intent_score"
+
+
+@pytest.mark.parametrize("snippets", [[], [_snippet("builtin_card_block", score=0.2)]])
+def test_skips_weak_or_missing_retrieval(snippets):
+    answer, decision = _responder().answer("card_block", 0.9, snippets)
+    assert answer is None and decision["reason"] == "retrieval_score"
+
+
+class _RecordingLLM(LLMProvider):
+    def __init__(self) -> None:
+        self.prompts = []
+
+    def generate(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return "LLM answer"
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    """The shipped corpus and intent examples, with an LLM that records calls."""
+    monkeypatch.chdir(REPO)
+    monkeypatch.setattr(config, "USE_EMBED_CACHE", False)
+    monkeypatch.setattr(config, "INTENT_CENTROIDS_FILE", str(tmp_path / "intent_centroids.npz"))
+    monkeypatch.setattr(config, "CORPUS_WATCH_INTERVAL_S", 0.0)
+    llm = _RecordingLLM()
+    monkeypatch.setattr(orchestrator_module, "build_llm_provider", lambda: llm)
+    logger = InteractionLogger(str(tmp_path / "chatlogs.jsonl"), async_mode=False)
+    return build_orchestrator(logger), llm
+
+
+def test_card_block_query_skips_llm(pipeline):
+    orchestrator, llm = pipeline
+    result = orchestrator.handle_message("How do I block my lost debit card?", [])
+    assert result["intent"] == "card_block"
+    assert result["sources"][0]["source"] == "card_blocking.txt"
+    assert result["response"].startswith("To block a lost or stolen debit or credit card")
+    assert llm.prompts == []
+
+
+def test_other_intents_still_reach_llm(pipeline):
+    orchestrator, llm = pipeline
+    result = orchestrator.handle_message("Which documents do I need for KYC?", [])
+    assert result["response"] == "LLM answer"
+    assert len(llm.prompts) == 1
@@ -0,0 +1,133 @@
+# tests/test_router.py
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from banking_bot import config
+from banking_bot.llm import OllamaProvider, RoutingProvider
+from banking_bot.llm.router import CircuitBreaker
+from banking_bot.metrics import MetricsRegistry
+from banking_bot.models import LLMResult
+from bench.fake_ollama import start_fake_ollama
+
+ANSWER = "Please use the official"  # first 4 fake tokens
+
+
+def _url(port: int) -> str:
+    return f"http://127.0.0.1:{port}/api/generate"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _router(urls, **kwargs) -> RoutingProvider:
+    return RoutingProvider([OllamaProvider(u, "test") for u in urls], metrics=MetricsRegistry(), **kwargs)
+
+
+@pytest.fixture
+def fake():
+    servers = []
+
+    def start(port: int = 0, latency_ms: float = 0.0):
+        server = start_fake_ollama(port, latency_ms=latency_ms, tokens_per_s=0, tokens=4)
+        servers.append(server)
+        return server, _url(server.server_address[1])
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _start_midstream_failure() -> str:
+    """Backend that sends two tokens, then drops the connection."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(8)
+
+    def serve() -> None:
+        while True:
+            conn, _ = sock.accept()
+            conn.recv(65536)
+            body = b"".join(json.dumps({"response": w, "done": False}).encode() + b"\n" for w in ("Hello", " there"))
+            conn.sendall(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n"
+                + b"%x\r\n%s\r\n" % (len(body), body)
+            )
+            conn.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return _url(sock.getsockname()[1])
+
+
+def test_breaker_opens_then_closes_after_half_open_probe(fake):
+    port = _free_port()
+    router = _router([_url(port)], hedge=False, failure_threshold=2, cooldown_s=0.3)
+    breaker = router._backends[0].breaker
+
+    for _ in range(2):
+        assert router.complete("q").failed
+    assert breaker.state == CircuitBreaker.OPEN
+
+    server, _ = fake(port)
+    assert router.complete("q").failed  # still open: the backend is not called
+    assert server.requests == 0
+
+    time.sleep(0.35)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    result = router.complete("q")
+    assert not result.failed and result.text == ANSWER
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert server.requests == 1
+
+
+def test_hedge_to_faster_backend_wins(fake, monkeypatch):
+    monkeypatch.setattr(config, "LLM_HEDGE_DEFAULT_DELAY_MS", 50.0)
+    monkeypatch.setattr(config, "LLM_HEDGE_MIN_DELAY_MS", 10.0)
+    _, slow_url = fake(latency_ms=2000)
+    fast, fast_url = fake()
+    router = _router([slow_url, fast_url], hedge=True)
+
+    started = time.perf_counter()
+    result = router.complete("q")
+    assert time.perf_counter() - started < 1.0
+    assert result.backend == fast_url and result.text == ANSWER
+    assert fast.requests == 1
+
+
+def test_dead_backend_fails_over(fake):
+    _, url = fake()
+    router = _router([_url(_free_port()), url], hedge=False)
+    result = router.complete("q")
+    assert not result.failed and result.backend == url
+
+
+def test_all_backends_dead_marks_result_failed():
+    router = _router([_url(_free_port())], hedge=False)
+    result = router.complete("q")
+    assert result.failed and result.text == config.LLM_ERROR_MSG
+
+
+def test_stream_fails_over_before_first_token(fake):
+    _, url = fake()
+    router = _router([_url(_free_port()), url])
+    result = LLMResult(text="")
+    assert "".join(router.stream("q", result=result)) == ANSWER
+    assert not result.failed and result.backend == url and result.context
+
+
+def test_stream_error_after_first_token_marks_result_failed(fake):
+    _, url = fake()
+    broken = _start_midstream_failure()
+    router = _router([broken, url])
+    result = LLMResult(text="")
+    chunks = list(router.stream("q", result=result))
+    assert chunks[:2] == ["Hello", " there"]
+    assert chunks[-1] == config.LLM_ERROR_MSG  # no fail-over once tokens were sent
+    assert result.failed and result.backend == broken